@@ -1,10 +1,12 @@
 import dash_bootstrap_components as dbc
 from dash_extensions.enrich import DashProxy, ServersideOutputTransform
 
+from my_project.serverside_backend import serverside_backend
+
 app = DashProxy(
     __name__,
     external_stylesheets=[dbc.themes.BOOTSTRAP],
-    transforms=[ServersideOutputTransform()],
+    transforms=[ServersideOutputTransform(backends=[serverside_backend])],
     suppress_callback_exceptions=True,
 )
 TIMEOUT = 600
@@ -1,10 +1,15 @@
+import os
+
 import dash
 import dash_bootstrap_components as dbc
 from dash import html, dcc
 from dash.dependencies import Input, Output
 
 from app import app
+from my_project import api  # noqa: F401 registers the API routes
 from my_project.layout import banner, build_tabs, footer
+from my_project.serverside_backend import janitor
+from my_project.station_map import plot_location_epw_files
 from my_project.page_changelog.app_changelog import changelog
 from my_project.tab_data_explorer.app_data_explorer import layout_data_explorer
 from my_project.tab_natural_ventilation.app_natural_ventilation import (
@@ -20,6 +25,9 @@ from my_project.tab_wind.app_wind import layout_wind
 from my_project.tab_clima_AI.app_clima_AI import layout_clima_AI
 
 server = app.server
+janitor.start(interval=int(os.environ.get("CLIMA_JANITOR_INTERVAL", 600)))
+# build the station map once at startup instead of on the first visit
+plot_location_epw_files()
 
 app.title = "CBE Clima Tool"
 app.layout = dbc.Container(
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from flask import jsonify, request
+
+from app import app
+from my_project.blob_store import epw_store
+from my_project.dataset_cache import DatasetCache, dataset_cache
+from my_project.dataset_metrics import (
+    column_payload,
+    monthly_degree_days,
+    parse_range,
+    psychrometrics_columns,
+    time_columns,
+    time_mask,
+    utci_columns,
+)
+from my_project.extract_df import get_data
+from my_project.station_catalog import load_catalog
+from my_project.station_index import nearest_stations
+from my_project.wind_cube import wind_rose_histogram
+
+server = app.server
+
+# metrics returned as columns, the columns query parameter selects a subset of them
+column_metrics = {"utci": utci_columns, "psychrometrics": psychrometrics_columns}
+metrics = list(column_metrics) + ["degree-days", "wind-rose"]
+# default degree days setpoints, as in the summary tab
+degree_day_setpoints = {"si": (10, 18), "ip": (50, 64)}
+
+max_cached_responses = int(os.environ.get("CLIMA_API_CACHE_ENTRIES", 256))
+_responses = OrderedDict()
+_responses_lock = threading.Lock()
+_station_digests = {}
+
+
+@server.route("/api/stations/nearest")
+def api_nearest_stations():
+    """Return the k stations nearest to the lat and lon query parameters."""
+    try:
+        lat = float(request.args["lat"])
+        lon = float(request.args["lon"])
+        k = int(request.args.get("k", 5))
+    except (KeyError, ValueError):
+        return jsonify(error="lat and lon must be numbers and k an integer"), 400
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180 and 1 <= k <= 100):
+        return jsonify(error="lat, lon or k out of range"), 400
+    return jsonify(stations=nearest_stations(lat, lon, k))
+
+
+@server.route("/api/datasets/<dataset>/<metric>")
+def api_dataset_metric(dataset, metric):
+    """Return a metric computed from the dataset of a station id or EPW hash.
+
+    The month and hour query parameters filter the hours used, as 'start-end'
+    ranges, and si_ip selects the unit system. Responses are cached and carry an
+    ETag, requests with a matching If-None-Match header get a 304 response.
+    """
+    if metric not in metrics:
+        return jsonify(error=f"metric must be one of {', '.join(metrics)}"), 404
+    try:
+        params = metric_params(metric, request.args)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+    digest = dataset_digest(dataset)
+    if digest is None:
+        return jsonify(error=f"dataset {dataset} not found"), 404
+
+    response = metric_response(digest, metric, params)
+    if response is None and digest != dataset:
+        # the EPW of the station was evicted from the caches, it is downloaded again
+        digest = dataset_digest(dataset, refresh=True)
+        if digest is not None:
+            response = metric_response(digest, metric, params)
+    if response is None:
+        return jsonify(error=f"dataset {dataset} is not available"), 404
+    return response
+
+
+def metric_response(digest, metric, params):
+    """Return the response of a metric request or None if the EPW is not available
+    anymore."""
+    # the ETag only depends on the request, so it is checked before computing
+    etag = hashlib.sha256(
+        json.dumps([DatasetCache.key(digest), metric, params]).encode("utf-8")
+    ).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = server.response_class(status=304)
+    else:
+        body = cached_response(etag, digest, metric, params)
+        if body is None:
+            return None
+        response = server.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    return response
+
+
+def metric_params(metric, args):
+    """Return the parameters of a metric request, raise a ValueError if they are not
+    valid."""
+    si_ip = args.get("si_ip", "si")
+    if si_ip not in ("si", "ip"):
+        raise ValueError("si_ip must be si or ip")
+    try:
+        params = {
+            "si_ip": si_ip,
+            "month": parse_range(args.get("month"), 1, 12),
+            "hour": parse_range(args.get("hour"), 1, 24),
+        }
+    except ValueError:
+        raise ValueError("month and hour must be ranges as start-end")
+
+    if metric in column_metrics:
+        columns = column_metrics[metric]
+        if args.get("columns"):
+            columns = args["columns"].split(",")
+            unknown = set(columns) - set(column_metrics[metric])
+            if unknown:
+                raise ValueError(f"unknown columns {', '.join(sorted(unknown))}")
+        params["columns"] = columns
+    elif metric == "degree-days":
+        hdd, cdd = degree_day_setpoints[si_ip]
+        try:
+            params["hdd"] = float(args.get("hdd", hdd))
+            params["cdd"] = float(args.get("cdd", cdd))
+        except ValueError:
+            raise ValueError("hdd and cdd must be numbers")
+    return params
+
+
+def dataset_digest(dataset, refresh=False):
+    """Return the digest of the EPW of a station id or an EPW hash, or None.
+
+    The EPW of a station is downloaded, or read from the mirror, the first time and
+    its dataset computed. With refresh, this is done again even if the station was
+    already resolved.
+    """
+    if re.fullmatch(r"[0-9a-f]{64}", dataset):
+        return dataset
+    if not dataset.isdigit():
+        return None
+    if refresh:
+        _station_digests.pop(dataset, None)
+    if dataset not in _station_digests:
+        try:
+            url = load_catalog().at[int(dataset), "url"]
+        except KeyError:
+            return None
+        lines = get_data(url)
+        if lines is None:
+            return None
+        digest = epw_store.put(lines)
+        dataset_cache.load(digest, url, lines=lines)
+        _station_digests[dataset] = digest
+    return _station_digests[dataset]
+
+
+def cached_response(etag, digest, metric, params):
+    """Return the JSON body of a metric, computed once and kept in an LRU cache."""
+    with _responses_lock:
+        if etag in _responses:
+            _responses.move_to_end(etag)
+            return _responses[etag]
+
+    payload = metric_payload(digest, metric, params)
+    if payload is None:
+        return None
+    # NaN and infinity are not valid JSON, they must be sent as null
+    body = json.dumps(
+        dict(dataset=digest, metric=metric, params=params, **payload), allow_nan=False
+    )
+
+    with _responses_lock:
+        _responses[etag] = body
+        while len(_responses) > max_cached_responses:
+            _responses.popitem(last=False)
+    return body
+
+
+def metric_payload(digest, metric, params):
+    """Compute a metric from the dataset of an EPW, return None if the EPW is not
+    available anymore."""
+    if metric in column_metrics:
+        columns = time_columns + params["columns"]
+    elif metric == "degree-days":
+        columns = ["month", "hour", "DBT"]
+    else:
+        columns = ["month", "hour", "wind_speed", "wind_dir"]
+    df = dataset_cache.columns(digest, columns, params["si_ip"])
+    if df is None:
+        return None
+    if metric == "wind-rose":
+        # the same rose as the wind tab, built from the wind cube of the dataset
+        return wind_rose_histogram(
+            df, params["si_ip"], params["month"], params["hour"]
+        )
+    df = df[time_mask(df, params["month"], params["hour"])]
+
+    if metric in column_metrics:
+        return {"data": column_payload(df)}
+    return monthly_degree_days(df, params["hdd"], params["cdd"])
@@ -0,0 +1,101 @@
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+
+cache_root = os.environ.get("CLIMA_CACHE_DIR", "cache")
+
+
+def epw_digest(lines):
+    """Return the sha256 hex digest of the content of an EPW file."""
+    content = "\n".join(lines).encode("utf-8", "surrogateescape")
+    return hashlib.sha256(content).hexdigest()
+
+
+def evict_files(cache_dir, max_bytes, suffix):
+    """Delete the least recently modified files or directories ending with suffix in
+    cache_dir until their total size is below max_bytes. The most recent one is
+    always kept."""
+    files = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(suffix):
+            try:
+                mtime = entry.stat().st_mtime
+                size = _size(entry)
+            except FileNotFoundError:
+                continue
+            files.append((mtime, size, entry.path))
+
+    total_bytes = sum(size for _, size, _ in files)
+    for _, size, file_path in sorted(files)[:-1]:
+        if total_bytes <= max_bytes:
+            break
+        if os.path.isdir(file_path):
+            shutil.rmtree(file_path, ignore_errors=True)
+        else:
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+        total_bytes -= size
+
+
+def _size(entry):
+    if entry.is_dir():
+        return sum(_size(child) for child in os.scandir(entry.path))
+    return entry.stat().st_size
+
+
+class BlobStore:
+    """Content-addressed store of the raw lines of EPW files.
+
+    The lines are saved gzip compressed in cache_dir under their sha256 digest, so the
+    browser only needs to keep the digest of the file it is working on. The least
+    recently used files are deleted when the store grows above max_bytes.
+    """
+
+    def __init__(self, cache_dir, max_bytes=512 * 2**20):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _file_path(self, digest):
+        return os.path.join(self.cache_dir, f"{digest}.epw.gz")
+
+    def put(self, lines):
+        """Save the lines and return their digest."""
+        digest = epw_digest(lines)
+        file_path = self._file_path(digest)
+        if os.path.exists(file_path):
+            os.utime(file_path)
+            return digest
+
+        # the directory is only created when the first file is saved
+        os.makedirs(self.cache_dir, exist_ok=True)
+        content = "\n".join(lines).encode("utf-8", "surrogateescape")
+        # write to a temporary file first so that readers never see partial files
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(gzip.compress(content, compresslevel=1))
+        os.replace(tmp_path, file_path)
+        evict_files(self.cache_dir, self.max_bytes, ".epw.gz")
+        return digest
+
+    def get(self, digest):
+        """Return the lines saved under digest or None if they are not available."""
+        if not isinstance(digest, str) or not digest.isalnum():
+            return None
+        file_path = self._file_path(digest)
+        try:
+            with open(file_path, "rb") as f:
+                content = gzip.decompress(f.read())
+            os.utime(file_path)
+        except (OSError, EOFError):
+            return None
+        return content.decode("utf-8", "surrogateescape").split("\n")
+
+
+epw_store = BlobStore(
+    cache_dir=os.path.join(cache_root, "epw"),
+    max_bytes=int(os.environ.get("CLIMA_EPW_STORE_DISK_MB", 512)) * 2**20,
+)
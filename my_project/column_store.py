@@ -0,0 +1,150 @@
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+SCHEMA_FILE = "schema.json"
+
+
+class ColumnStore:
+    """On-disk store of dataframes in a columnar, memory-mappable format.
+
+    Each dataframe is saved in its own key.columns directory with one .npy file per
+    column and a schema.json file that lists the columns, their dtype and the
+    metadata saved with the dataframe. Numeric columns are opened memory-mapped and
+    read-only, so reading a dataframe, or a few of its columns, only touches the
+    pages of the columns that are used.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _dir_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.columns")
+
+    def has(self, key):
+        return os.path.exists(os.path.join(self._dir_path(key), SCHEMA_FILE))
+
+    def modified(self, key):
+        """Return the time when key was written or None if it does not exist."""
+        try:
+            return os.path.getmtime(os.path.join(self._dir_path(key), SCHEMA_FILE))
+        except OSError:
+            return None
+
+    def substore(self, key):
+        """Return a column store saved inside the directory of key, which is deleted
+        together with key, or None if key does not exist."""
+        if not self.has(key):
+            return None
+        return ColumnStore(self._dir_path(key))
+
+    def write(self, key, df, metadata=None, replace=False):
+        """Save df and its JSON-serializable metadata under key.
+
+        Keys are written once, unless replace is true the dataframe is not saved if
+        the key already exists."""
+        # created on the first write, a store that was never written has no keys
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # write to a temporary directory first so that readers never see partial
+        # datasets, the directory is then renamed atomically
+        tmp_path = tempfile.mkdtemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            schema = {
+                "index": dict(
+                    name=df.index.name,
+                    **_save_array(tmp_path, "index", pd.Series(df.index)),
+                ),
+                "columns": [
+                    dict(name=col, **_save_array(tmp_path, str(ix), df[col]))
+                    for ix, col in enumerate(df.columns)
+                ],
+                "metadata": metadata,
+            }
+            with open(os.path.join(tmp_path, SCHEMA_FILE), "w") as f:
+                json.dump(schema, f)
+            if replace and os.path.exists(self._dir_path(key)):
+                old_path = tempfile.mkdtemp(dir=self.cache_dir, suffix=".tmp")
+                os.replace(self._dir_path(key), old_path)
+                shutil.rmtree(old_path, ignore_errors=True)
+            os.replace(tmp_path, self._dir_path(key))
+        except OSError:
+            # the key has been written by another process in the meantime
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            if not self.has(key):
+                raise
+
+    def read(self, key, columns=None):
+        """Return the (df, metadata) tuple saved under key or None.
+
+        If columns is not None only those columns are opened, in the given order.
+        """
+        dir_path = self._dir_path(key)
+        try:
+            with open(os.path.join(dir_path, SCHEMA_FILE)) as f:
+                schema = json.load(f)
+            # refresh the modification time, it is used as the last access time
+            os.utime(dir_path)
+
+            column_info = {info["name"]: info for info in schema["columns"]}
+            if columns is None:
+                columns = list(column_info)
+            data = {col: _load_array(dir_path, column_info[col]) for col in columns}
+            index = pd.Index(
+                _load_array(dir_path, schema["index"]), name=schema["index"]["name"]
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+        return pd.DataFrame(data, index=index, copy=False), schema["metadata"]
+
+
+def _save_array(dir_path, name, values):
+    """Save the values of a series as name.npy and return the information needed
+    to load them back."""
+    dtype = values.dtype
+    info = {"file": f"{name}.npy", "kind": "array"}
+    if isinstance(dtype, pd.CategoricalDtype):
+        info.update(
+            kind="category",
+            categories=dtype.categories.tolist(),
+            ordered=bool(dtype.ordered),
+        )
+        array = values.cat.codes.to_numpy()
+    elif isinstance(dtype, pd.DatetimeTZDtype):
+        info.update(kind="datetime", tz=str(dtype.tz))
+        array = values.dt.tz_convert(None).to_numpy()
+    elif dtype == object:
+        # strings are saved as fixed width unicode and converted back on load, the
+        # missing values are saved in a mask next to them
+        info.update(kind="object")
+        nulls = values.isna().to_numpy()
+        if nulls.any():
+            info.update(nulls=f"{name}.nulls.npy")
+            np.save(os.path.join(dir_path, info["nulls"]), nulls, allow_pickle=False)
+        array = np.asarray(values.where(~nulls, ""), dtype=str)
+    else:
+        array = values.to_numpy()
+    np.save(os.path.join(dir_path, info["file"]), array, allow_pickle=False)
+    return info
+
+
+def _load_array(dir_path, info):
+    # plain ndarray view of the memory map, the data is not copied
+    array = np.asarray(
+        np.load(os.path.join(dir_path, info["file"]), mmap_mode="r", allow_pickle=False)
+    )
+    if info["kind"] == "category":
+        return pd.Categorical.from_codes(
+            array, categories=info["categories"], ordered=info["ordered"]
+        )
+    if info["kind"] == "datetime":
+        return pd.DatetimeIndex(array).tz_localize("UTC").tz_convert(info["tz"]).array
+    if info["kind"] == "object":
+        array = array.astype(object)
+        if "nulls" in info:
+            array[np.load(os.path.join(dir_path, info["nulls"]))] = None
+        return array
+    return array
@@ -0,0 +1,204 @@
+import os
+import threading
+from collections import OrderedDict
+
+from my_project.blob_store import cache_root, epw_digest, epw_store, evict_files
+from my_project.column_store import ColumnStore
+from my_project.shared_dataset import SharedDataset
+from my_project.extract_df import create_df
+from my_project.stats_cube import StatsCube, stats_cube
+from my_project.units import to_units
+from my_project.year_calendar import calendar_columns, with_calendar
+
+# bump every time the output of create_df changes so that datasets computed by an
+# older version of the pipeline are not reused
+PIPELINE_VERSION = 2
+
+
+class DatasetCache:
+    """Content-addressed LRU cache of the datasets computed by create_df.
+
+    Each entry holds the SI dataframe and the location info of an EPW file and it is
+    keyed by the hash of the file content and the pipeline version. The entries are
+    kept in memory up to max_memory_bytes and saved in a column store in cache_dir
+    up to max_disk_bytes, the least recently used ones are evicted first. The
+    dataframes kept in memory are shared read-only between callers, each caller gets
+    its own view of them.
+    """
+
+    def __init__(self, cache_dir=None, max_memory_bytes=256 * 2**20, max_disk_bytes=0):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.store = ColumnStore(self.cache_dir) if self.cache_dir else None
+
+    @staticmethod
+    def key(digest):
+        return f"v{PIPELINE_VERSION}-{digest}"
+
+    def get(self, key):
+        """Return the (df, location_info) tuple stored under key or None."""
+        value = self._get_memory(key)
+        if value is not None:
+            return value
+
+        value = self._read_disk(key)
+        if value is not None:
+            value = self._set_memory(key, value)
+        return value
+
+    def set(self, key, value):
+        """Store value under key and return it with a view of the shared dataframe."""
+        self._write_disk(key, value)
+        return self._set_memory(key, value)
+
+    def get_or_create(self, lines, file_name, si_ip="si"):
+        """Return the dataframe and location info of an EPW, running create_df only
+        if the file is not in the cache yet.
+
+        The dataframe is returned in the 'si' or 'ip' unit system, IP views are
+        computed from the SI dataframe once and cached in memory next to it.
+        """
+        return self.load(epw_digest(lines), file_name, si_ip, lines)
+
+    def load(self, digest, file_name, si_ip="si", lines=None):
+        """Same as get_or_create but the EPW is identified by its digest, if the
+        dataset is not cached the lines are read from the EPW blob store. Returns
+        (None, None) if the EPW is not available anymore."""
+        key = self.key(digest)
+        value = self.get(key)
+        if value is None:
+            if lines is None:
+                lines = epw_store.get(digest)
+                if lines is None:
+                    return None, None
+            value = create_df(lines, file_name)
+            cube = stats_cube(value[0])
+            # the cube is cached first so that it is evicted before its dataset
+            self._set_memory(f"{key}-stats-si", (cube.table, None))
+            value = self.set(key, value)
+            self._write_stats(key, cube)
+        df, location_info = value
+        if si_ip == "ip":
+            df = self.ip_view(key, df)
+        return df, dict(location_info, url=file_name)
+
+    def columns(self, digest, columns, si_ip="si"):
+        """Return only some columns of the dataframe of an EPW or None if the EPW is
+        not available anymore.
+
+        If the dataset is not in memory only the requested columns are opened from
+        the column store, memory-mapped, without loading the rest of the dataset.
+        """
+        key = self.key(digest)
+        value = self._get_memory(key)
+        if value is not None:
+            df = value[0]
+        else:
+            stored = [col for col in columns if col not in calendar_columns]
+            value = self.store.read(key, stored) if self.store else None
+            if value is None:
+                df, _ = self.load(digest, None)
+                if df is None:
+                    return None
+            else:
+                df = with_calendar(value[0])
+        return to_units(df, si_ip, columns)
+
+    def stats(self, digest, si_ip="si"):
+        """Return the statistics cube of the dataset of an EPW in the 'si' or 'ip'
+        unit system or None if the EPW is not available anymore.
+
+        The cube is computed when the dataset is created and saved with it, the
+        cubes of datasets saved without one are computed on first use.
+        """
+        key = self.key(digest)
+        si_key, view_key = f"{key}-stats-si", f"{key}-stats-{si_ip}"
+        value = self._get_memory(view_key)
+        if value is not None:
+            return StatsCube(value[0])
+
+        value = self._get_memory(si_key)
+        if value is None:
+            cube = self._read_stats(key)
+            if cube is None:
+                df, _ = self.load(digest, None)
+                if df is None:
+                    return None
+                value = self._get_memory(si_key)
+                cube = StatsCube(value[0]) if value else stats_cube(df)
+                self._write_stats(key, cube)
+            value = self._set_memory(si_key, (cube.table, None))
+        cube = StatsCube(value[0])
+        if si_ip == "ip":
+            cube = cube.to_units("ip")
+            cube = StatsCube(self._set_memory(view_key, (cube.table, None))[0])
+        return cube
+
+    def ip_view(self, key, df):
+        """Return the cached IP view of the SI dataframe stored under key."""
+        view_key = f"{key}-ip"
+        value = self._get_memory(view_key)
+        if value is None:
+            value = self._set_memory(view_key, (to_units(df, "ip"), None))
+        return value[0]
+
+    def _get_memory(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            shared, info = self._entries[key][0]
+        return shared.view(), info
+
+    def _set_memory(self, key, value):
+        """Keep the (df, info) value in memory under key and return it with a view of
+        the shared dataframe."""
+        if not self.max_memory_bytes:
+            return value
+        shared = SharedDataset(value[0])
+        with self._lock:
+            if key in self._entries:
+                self._memory_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = ((shared, value[1]), shared.nbytes)
+            self._memory_bytes += shared.nbytes
+            while self._memory_bytes > self.max_memory_bytes and len(self._entries) > 1:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._memory_bytes -= evicted_bytes
+        return shared.view(), value[1]
+
+    def _read_stats(self, key):
+        store = self.store.substore(key) if self.store else None
+        value = store.read("stats") if store else None
+        return StatsCube(value[0]) if value else None
+
+    def _write_stats(self, key, cube):
+        # the cube is saved inside the directory of the dataset, so they are
+        # evicted together
+        store = self.store.substore(key) if self.store else None
+        if store and not store.has("stats"):
+            store.write("stats", cube.table)
+
+    def _read_disk(self, key):
+        value = self.store.read(key) if self.store else None
+        if value is None:
+            return None
+        return with_calendar(value[0]), value[1]
+
+    def _write_disk(self, key, value):
+        if not self.store or not self.max_disk_bytes or self.store.has(key):
+            return
+        df, location_info = value
+        # the calendar columns are shared by all the datasets, they are not saved
+        self.store.write(key, df.drop(columns=calendar_columns), location_info)
+        evict_files(self.cache_dir, self.max_disk_bytes, ".columns")
+
+
+dataset_cache = DatasetCache(
+    cache_dir=os.path.join(cache_root, "datasets"),
+    max_memory_bytes=int(os.environ.get("CLIMA_DATASET_CACHE_MEMORY_MB", 256)) * 2**20,
+    max_disk_bytes=int(os.environ.get("CLIMA_DATASET_CACHE_DISK_MB", 2048)) * 2**20,
+)
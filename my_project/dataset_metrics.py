@@ -0,0 +1,77 @@
+import numpy as np
+
+# columns identifying the hour of each row, returned with every column projection
+time_columns = ["month", "day", "hour"]
+
+utci_columns = [
+    "utci_noSun_Wind",
+    "utci_noSun_noWind",
+    "utci_Sun_Wind",
+    "utci_Sun_noWind",
+    "utci_noSun_Wind_categories",
+    "utci_noSun_noWind_categories",
+    "utci_Sun_Wind_categories",
+    "utci_Sun_noWind_categories",
+]
+psychrometrics_columns = [
+    "DBT",
+    "RH",
+    "p_atm",
+    "p_sat",
+    "p_vap",
+    "hr",
+    "t_wb",
+    "t_dp",
+    "h",
+]
+
+
+def parse_range(value, lowest, highest):
+    """Parse a 'start-end' or 'value' query parameter into a (start, end) tuple.
+
+    Ranges are inclusive and wrap around when start is greater than end, e.g.
+    month=11-2 selects November to February. A ValueError is raised if the range
+    is not valid.
+    """
+    if value is None:
+        return lowest, highest
+    start, _, end = value.partition("-")
+    start = int(start)
+    end = int(end) if end else start
+    if not (lowest <= start <= highest and lowest <= end <= highest):
+        raise ValueError(f"{value} is not between {lowest} and {highest}")
+    return start, end
+
+
+def in_range(values, start, end):
+    """Return the mask of the values in the inclusive, wrapping range."""
+    if start <= end:
+        return (values >= start) & (values <= end)
+    return (values >= start) | (values <= end)
+
+
+def time_mask(df, month, hour):
+    """Return the mask of the rows of df in the month and hour ranges."""
+    return in_range(df["month"].values, *month) & in_range(df["hour"].values, *hour)
+
+
+def column_payload(df):
+    """Return the columns of df as JSON-serializable lists, NaN becomes null."""
+    return {
+        col: df[col].astype(object).where(df[col].notna(), None).tolist()
+        for col in df.columns
+    }
+
+
+def monthly_degree_days(df, hdd_setpoint, cdd_setpoint):
+    """Return the heating and cooling degree days of each month, computed as in the
+    degree days chart of the summary tab."""
+    months = df["month"].values - 1
+    dbt = df["DBT"].values
+    hdd = np.bincount(months, np.minimum(dbt - hdd_setpoint, 0), minlength=12) / 24
+    cdd = np.bincount(months, np.maximum(dbt - cdd_setpoint, 0), minlength=12) / 24
+    return {
+        "month": list(range(1, 13)),
+        "hdd": hdd.astype(int).tolist(),
+        "cdd": cdd.astype(int).tolist(),
+    }
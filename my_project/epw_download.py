@@ -0,0 +1,125 @@
+import os
+import tempfile
+import zipfile
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+connect_timeout = float(os.environ.get("CLIMA_DOWNLOAD_CONNECT_TIMEOUT", 5))
+read_timeout = float(os.environ.get("CLIMA_DOWNLOAD_READ_TIMEOUT", 30))
+max_download_bytes = int(os.environ.get("CLIMA_DOWNLOAD_MAX_MB", 50)) * 2**20
+# downloads larger than this are spooled to a temporary file instead of memory
+spool_bytes = 4 * 2**20
+chunk_bytes = 64 * 2**10
+
+
+class DownloadError(Exception):
+    """Raised when an EPW file can not be downloaded."""
+
+
+def create_session(retries=3, backoff_factor=0.5, pool_maxsize=32):
+    """Return a requests session with a connection pool and bounded retries with
+    exponential backoff for connection errors and temporary server errors."""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=8, pool_maxsize=pool_maxsize, max_retries=retry
+    )
+    session = requests.Session()
+    session.headers["User-Agent"] = "Mozilla/5.0"
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# shared by all the threads of a worker, requests sessions are thread safe when
+# they are only used to send requests
+session = create_session()
+
+
+def download(url, max_bytes=None):
+    """Stream the content of url into a temporary file and return it.
+
+    The file is kept in memory unless it is larger than spool_bytes. A DownloadError
+    is raised if the request fails, times out or the content is larger than
+    max_bytes.
+    """
+    max_bytes = max_download_bytes if max_bytes is None else max_bytes
+    f = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+    try:
+        with session.get(
+            url, stream=True, timeout=(connect_timeout, read_timeout)
+        ) as response:
+            if response.status_code != 200:
+                raise DownloadError(f"{url} returned status {response.status_code}")
+            content_length = response.headers.get("Content-Length")
+            if content_length and int(content_length) > max_bytes:
+                raise DownloadError(f"{url} is larger than {max_bytes} bytes")
+
+            size = 0
+            for chunk in response.iter_content(chunk_size=chunk_bytes):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise DownloadError(f"{url} is larger than {max_bytes} bytes")
+                f.write(chunk)
+    except (requests.RequestException, ValueError) as e:
+        f.close()
+        raise DownloadError(f"Could not download {url}: {e}") from e
+    except BaseException:
+        # the file is only handed to the caller if the download succeeds
+        f.close()
+        raise
+    f.seek(0)
+    return f
+
+
+def decode_epw(content):
+    """Return the lines of the content of an EPW file."""
+    try:
+        text = content.decode("utf-8")
+    except UnicodeDecodeError:
+        text = content.decode("latin-1")
+    return text.splitlines()
+
+
+def is_epw(lines):
+    """Return True if lines are those of an EPW file, a LOCATION line and the other
+    7 header lines followed by the 8760 hourly rows."""
+    rows = [line for line in lines[8:] if line.strip()]
+    return bool(lines) and lines[0].startswith("LOCATION,") and len(rows) == 8760
+
+
+def read_epw_from_zip(f, max_bytes=None):
+    """Return the content of the first EPW file in a zip archive."""
+    max_bytes = max_download_bytes if max_bytes is None else max_bytes
+    try:
+        with zipfile.ZipFile(f) as zf:
+            for info in zf.infolist():
+                if info.filename.lower().endswith(".epw"):
+                    if info.file_size > max_bytes:
+                        raise DownloadError(f"{info.filename} is too large")
+                    with zf.open(info) as member:
+                        return member.read(max_bytes + 1)
+    except zipfile.BadZipFile as e:
+        raise DownloadError(f"Invalid zip file: {e}") from e
+    raise DownloadError("The zip file does not contain an EPW file")
+
+
+def download_epw(url):
+    """Download an EPW file, or a zip archive containing one, and return the content
+    of the EPW file."""
+    with download(url) as f:
+        if url.endswith("zip") or url.endswith("all"):
+            return read_epw_from_zip(f)
+        return f.read()
+
+
+def download_epw_lines(url):
+    """Download an EPW file, or a zip archive containing one, and return its lines."""
+    return decode_epw(download_epw(url))
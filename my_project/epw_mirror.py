@@ -0,0 +1,65 @@
+import gzip
+import hashlib
+import os
+import tempfile
+import zlib
+
+from my_project.blob_store import cache_root, evict_files
+
+
+class EpwMirror:
+    """Local mirror of the EPW files downloaded from the EnergyPlus and
+    Climate.OneBuilding.Org websites, keyed by their URL.
+
+    Each file is saved gzip compressed in cache_dir under the sha256 digest of its URL,
+    preceded by a line with the sha256 digest of its content which is checked on
+    every read. Files are written atomically, so the mirror can be shared by several
+    workers, and the least recently used files are deleted when the mirror grows
+    above max_bytes.
+    """
+
+    def __init__(self, cache_dir, max_bytes=1024 * 2**20):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _file_path(self, url):
+        url_digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{url_digest}.epw.gz")
+
+    def get(self, url):
+        """Return the content of the EPW file downloaded from url or None."""
+        file_path = self._file_path(url)
+        try:
+            with open(file_path, "rb") as f:
+                digest = f.readline().strip().decode("ascii")
+                content = gzip.decompress(f.read())
+            os.utime(file_path)
+        except (OSError, EOFError, UnicodeDecodeError, zlib.error):
+            return None
+        if hashlib.sha256(content).hexdigest() != digest:
+            # the file is corrupted, it is downloaded again
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+            return None
+        return content
+
+    def put(self, url, content):
+        """Save the content of the EPW file downloaded from url."""
+        digest = hashlib.sha256(content).hexdigest()
+        # created by the first download, importing the module creates no directory
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # write to a temporary file first so that readers never see partial files
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(f"{digest}\n".encode("ascii"))
+            f.write(gzip.compress(content, compresslevel=1))
+        os.replace(tmp_path, self._file_path(url))
+        evict_files(self.cache_dir, self.max_bytes, ".epw.gz")
+
+
+epw_mirror = EpwMirror(
+    cache_dir=os.path.join(cache_root, "mirror"),
+    max_bytes=int(os.environ.get("CLIMA_EPW_MIRROR_DISK_MB", 1024)) * 2**20,
+)
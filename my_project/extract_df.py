@@ -1,47 +1,40 @@
 import io
-import json
 import re
-import zipfile
-from datetime import timedelta
-from urllib.request import Request, urlopen
-
 import math
 import numpy as np
 import pandas as pd
-import requests
 from pvlib import solarposition
-from pythermalcomfort import psychrometrics as psy
 from pythermalcomfort.models import adaptive_ashrae
-from pythermalcomfort.models import solar_gain
 from pythermalcomfort.models import utci
-from pythermalcomfort.utilities import running_mean_outdoor_temperature
 
-from my_project.global_scheme import month_lst
+from my_project.epw_download import DownloadError, decode_epw, download_epw, is_epw
+from my_project.epw_mirror import epw_mirror
+from my_project.psychrometrics import psy_ta_rh
+from my_project.solar_gain import solar_gain
+from my_project.year_calendar import calendar_table, local_times, with_calendar
 
 
 def get_data(source_url):
-    """Return a list of the data from api call."""
-    if source_url[-3:] == "zip" or source_url[-3:] == "all":
-        request = requests.get(source_url)
-        if request.status_code != 404:
-            zf = zipfile.ZipFile(io.BytesIO(request.content))
-            for i in zf.namelist():
-                if i[-3:] == "epw":
-                    epw_name = i
-                    data = zf.read(epw_name)
-                    data = repr(data).split("\\n")
-                    return data
-        else:
-            print("returning none")
-            return None
-    else:
-        try:
-            headers = {"User-Agent": "Mozilla/5.0"}
-            req = Request(source_url, headers=headers)
-            epw = urlopen(req).read().decode()
-            return epw.split("\n")
-        except:
-            return None
+    """Return the lines of the EPW file at source_url, or of the EPW file in the zip
+    archive at source_url, or None if it can not be downloaded.
+
+    Downloaded files are saved in the local EPW mirror and read from it afterwards,
+    content which is not an EPW file, like the HTML page of an error, is not saved.
+    """
+    content = epw_mirror.get(source_url)
+    if content is not None:
+        lines = decode_epw(content)
+        if is_epw(lines):
+            return lines
+    try:
+        content = download_epw(source_url)
+    except DownloadError:
+        return None
+    lines = decode_epw(content)
+    if not is_epw(lines):
+        return None
+    epw_mirror.put(source_url, content)
+    return lines
 
 
 def get_location_info(lst, file_name):
@@ -69,6 +62,87 @@ def get_location_info(lst, file_name):
     return location_info
 
 
+# names of the EPW data fields kept in the dataframe, in file order
+epw_col_names = [
+    "year",
+    "month",
+    "day",
+    "hour",
+    "DBT",
+    "DPT",
+    "RH",
+    "p_atm",
+    "extr_hor_rad",
+    "hor_ir_rad",
+    "glob_hor_rad",
+    "dir_nor_rad",
+    "dif_hor_rad",
+    "glob_hor_ill",
+    "dir_nor_ill",
+    "dif_hor_ill",
+    "Zlumi",
+    "wind_dir",
+    "wind_speed",
+    "tot_sky_cover",
+    "Oskycover",
+    "Vis",
+    "Cheight",
+    "PWobs",
+    "PWcodes",
+    "Pwater",
+    "AsolOptD",
+    "SnowD",
+    "DaySSnow",
+]
+
+
+def read_epw_data(lst):
+    """Parse the 8760 hourly rows of an EPW file in a single pass.
+
+    The minute, data source flags and extraterrestrial direct normal radiation
+    fields are skipped together with the last three fields of each row. If the
+    file has fewer fields than expected the missing columns are filled with 9999.
+    """
+    rows = lst[8:8768]
+    n_fields = len(rows[0].strip().split(","))
+    use_cols = [ix for ix in range(n_fields - 3) if ix not in (4, 5, 11)]
+    use_cols = use_cols[: len(epw_col_names)]
+    names = epw_col_names[: len(use_cols)]
+    int_cols = ["year", "month", "day", "hour"]
+
+    epw_df = pd.read_csv(
+        io.StringIO("\n".join(rows)),
+        header=None,
+        names=range(n_fields),
+        usecols=use_cols,
+        dtype={
+            ix: int if name in int_cols else float for ix, name in zip(use_cols, names)
+        },
+        float_precision="round_trip",
+    )
+    epw_df.columns = names
+
+    # assign 9999 to the columns that are missing in the file
+    for col in epw_col_names[len(names) :]:
+        epw_df[col] = 9999.0
+
+    return epw_df
+
+
+def running_mean_outdoor_temperatures(dbt_day_ave, alpha=0.9, n=7):
+    """Return the running mean outdoor temperature of each day of the year.
+
+    For each day the mean daily temperatures of the previous n days are weighted
+    as in pythermalcomfort's running_mean_outdoor_temperature, the days at the
+    beginning of the year wrap around to the end of the year.
+    """
+    coeff = [alpha**ix for ix in range(n)]
+    t_rm = 0
+    for ix in range(n):
+        t_rm = t_rm + coeff[ix] * np.roll(dbt_day_ave, ix + 1)
+    return np.around(t_rm / sum(coeff), 1)
+
+
 def create_df(lst, file_name):
     """Extract and clean the data. Return a pandas data from a url."""
     meta = lst[0].strip().replace("\\r", "").split(",")
@@ -91,60 +165,11 @@ def create_df(lst, file_name):
     except AttributeError:
         pass
 
-    lst = lst[8:8768]
-    lst = [line.strip().split(",") for line in lst]
-
-    # Each data row exclude index 4 and 5, and everything after days now
-    for line in lst:
-        del line[4:6]
-        del line[9]
-        del line[-1]
-        del line[-1]
-        del line[-1]
-
-    col_names = [
-        "year",
-        "month",
-        "day",
-        "hour",
-        "DBT",
-        "DPT",
-        "RH",
-        "p_atm",
-        "extr_hor_rad",
-        "hor_ir_rad",
-        "glob_hor_rad",
-        "dir_nor_rad",
-        "dif_hor_rad",
-        "glob_hor_ill",
-        "dir_nor_ill",
-        "dif_hor_ill",
-        "Zlumi",
-        "wind_dir",
-        "wind_speed",
-        "tot_sky_cover",
-        "Oskycover",
-        "Vis",
-        "Cheight",
-        "PWobs",
-        "PWcodes",
-        "Pwater",
-        "AsolOptD",
-        "SnowD",
-        "DaySSnow",
-    ]
-
-    # assign column names, if fewer cols are there than supposed assign 9999 to that col
-    if len(lst[0]) < len(col_names):
-        epw_df = pd.DataFrame(columns=col_names[: len(lst[0])], data=lst)
-        for col in [x for ix, x in enumerate(col_names) if ix >= len(lst[0])]:
-            epw_df[col] = 9999
-    else:
-        epw_df = pd.DataFrame(columns=col_names, data=lst)
+    epw_df = read_epw_data(lst)
 
     # from EnergyPlus files extract info about reference years
     if not location_info["period"]:
-        years = epw_df["year"].astype("int").unique()
+        years = epw_df["year"].unique()
         if len(years) == 1:
             year_rounded_up = int(math.ceil(years[0] / 10.0)) * 10
             location_info["period"] = f"{year_rounded_up-10}-{year_rounded_up}"
@@ -153,61 +178,8 @@ def create_df(lst, file_name):
             max_year = int(math.ceil(max(years) / 10.0)) * 10
             location_info["period"] = f"{min_year}-{max_year}"
 
-    # Add fake_year
-    epw_df["fake_year"] = "year"
-
-    # Add in month names
-    month_look_up = {ix + 1: month for ix, month in enumerate(month_lst)}
-    epw_df["month_names"] = epw_df["month"].astype("int").map(month_look_up)
-
-    # Change to int type
-    epw_df[["year", "day", "month", "hour"]] = epw_df[
-        ["year", "day", "month", "hour"]
-    ].astype(int)
-
-    # Add in DOY
-    df_doy = epw_df.groupby(["month", "day"])["hour"].count().reset_index()
-    df_doy["DOY"] = df_doy.index + 1
-    epw_df = pd.merge(
-        epw_df, df_doy[["month", "day", "DOY"]], on=["month", "day"], how="left"
-    )
-
-    change_to_float = [
-        "DBT",
-        "DPT",
-        "RH",
-        "p_atm",
-        "extr_hor_rad",
-        "hor_ir_rad",
-        "glob_hor_rad",
-        "dir_nor_rad",
-        "dif_hor_rad",
-        "glob_hor_ill",
-        "dir_nor_ill",
-        "dif_hor_ill",
-        "Zlumi",
-        "wind_dir",
-        "wind_speed",
-        "tot_sky_cover",
-        "Oskycover",
-        "Vis",
-        "Cheight",
-        "PWobs",
-        "PWcodes",
-        "Pwater",
-        "AsolOptD",
-        "SnowD",
-        "DaySSnow",
-    ]
-    epw_df[change_to_float] = epw_df[change_to_float].astype(float)
-
-    # Add in times df
-    times = pd.date_range(
-        "2019-01-01 00:00:00", "2020-01-01", inclusive="left", freq="h", tz="UTC"
-    )
-    epw_df["UTC_time"] = pd.to_datetime(times)
-    delta = timedelta(days=0, hours=location_info["time_zone"] - 1, minutes=0)
-    times = times - delta
+    # Add in times df, the calendar columns are appended from the shared calendar
+    times = local_times(location_info["time_zone"])
     epw_df["times"] = times
     epw_df.set_index(
         "times", drop=False, append=False, inplace=True, verify_integrity=False
@@ -221,31 +193,19 @@ def create_df(lst, file_name):
 
     # Add in UTCI
     sol_altitude = epw_df["elevation"].mask(epw_df["elevation"] <= 0, 0)
-    sharp = [45] * 8760
-    sol_radiation_dir = epw_df["dir_nor_rad"]
-    sol_transmittance = [1] * 8760  # CHECK VALUE
-    f_svv = [1] * 8760  # CHECK VALUE
-    f_bes = [1] * 8760  # CHECK VALUE
-    asw = [0.7] * 8760  # CHECK VALUE
-    posture = ["standing"] * 8760
-    floor_reflectance = [0.6] * 8760  # EXPOSE AS A VARIABLE?
-
-    mrt = np.vectorize(solar_gain)(
-        sol_altitude,
-        sharp,
-        sol_radiation_dir,
-        sol_transmittance,
-        f_svv,
-        f_bes,
-        asw,
-        posture,
-        floor_reflectance,
+    mrt = solar_gain(
+        sol_altitude=sol_altitude.values,
+        sharp=45,
+        sol_radiation_dir=epw_df["dir_nor_rad"].values,
+        sol_transmittance=1,  # CHECK VALUE
+        f_svv=1,  # CHECK VALUE
+        f_bes=1,  # CHECK VALUE
+        asw=0.7,  # CHECK VALUE
+        posture="standing",
+        floor_reflectance=0.6,  # EXPOSE AS A VARIABLE?
     )
-    mrt_df = pd.DataFrame.from_records(mrt)
-    mrt_df["delta_mrt"] = mrt_df["delta_mrt"].mask(mrt_df["delta_mrt"] >= 70, 70)
-    mrt_df = mrt_df.set_index(epw_df.times)
-
-    epw_df = epw_df.join(mrt_df)
+    epw_df["erf"] = mrt["erf"]
+    epw_df["delta_mrt"] = np.minimum(mrt["delta_mrt"], 70)
 
     epw_df["MRT"] = epw_df["delta_mrt"] + epw_df["DBT"]
     epw_df["wind_speed_utci"] = epw_df["wind_speed"]
@@ -287,98 +247,33 @@ def create_df(lst, file_name):
     )
 
     # Add psy values
-    ta_rh = np.vectorize(psy.psy_ta_rh)(epw_df["DBT"], epw_df["RH"])
-    psy_df = pd.DataFrame.from_records(ta_rh)
-    psy_df = psy_df.set_index(epw_df.times)
-    epw_df = epw_df.join(psy_df)
+    ta_rh = psy_ta_rh(epw_df["DBT"].values, epw_df["RH"].values)
+    for name, values in ta_rh.items():
+        epw_df[name] = values
 
     # calculate adaptive data
-    dbt_day_ave = epw_df.groupby(["DOY"])["DBT"].mean().to_list()
-    n = 7
-    epw_df["adaptive_comfort"] = np.nan
-    epw_df["adaptive_cmf_80_low"] = np.nan
-    epw_df["adaptive_cmf_80_up"] = np.nan
-    epw_df["adaptive_cmf_90_low"] = np.nan
-    epw_df["adaptive_cmf_90_up"] = np.nan
-    epw_df["adaptive_cmf_rmt"] = np.nan
-    for day in epw_df.DOY.unique():
-        i = day - 1
-        if i < n:
-            last_days = dbt_day_ave[-n + i :] + dbt_day_ave[0:i]
-        else:
-            last_days = dbt_day_ave[i - n : i]
-        last_days.reverse()
-        rmt = running_mean_outdoor_temperature(last_days, alpha=0.9)
-
-        if rmt > 40:
-            rmt = 40.1
-        elif rmt < 10:
-            rmt = 9.9
-        r = adaptive_ashrae(
-            tdb=dbt_day_ave[i],
-            tr=dbt_day_ave[i],
-            t_running_mean=rmt,
-            v=0.5,
-            limit_inputs=False,
-        )
-        epw_df.loc[epw_df.DOY == day, "adaptive_cmf_rmt"] = rmt
-        epw_df.loc[epw_df.DOY == day, "adaptive_comfort"] = r["tmp_cmf"]
-        epw_df.loc[epw_df.DOY == day, "adaptive_cmf_80_low"] = r["tmp_cmf_80_low"]
-        epw_df.loc[epw_df.DOY == day, "adaptive_cmf_80_up"] = r["tmp_cmf_80_up"]
-        epw_df.loc[epw_df.DOY == day, "adaptive_cmf_90_low"] = r["tmp_cmf_90_low"]
-        epw_df.loc[epw_df.DOY == day, "adaptive_cmf_90_up"] = r["tmp_cmf_90_up"]
-
-    return epw_df, location_info
-
-
-# convert function
-def temperature(df, name):
-    df[name] = df[name] * 1.8 + 32
-
-
-def pressure(df, name):
-    df[name] = df[name] * 0.000145038
-
-
-def irradiation(df, name):
-    df[name] = df[name] * 0.3169983306
-
-
-def illuminance(df, name):
-    df[name] = df[name] * 0.0929
-
-
-def zenith_illuminance(df, name):
-    df[name] = df[name] * 0.0929
-
-
-def speed(df, name):
-    df[name] = df[name] * 196.85039370078738
-
-
-def visibility(df, name):
-    df[name] = df[name] * 0.6215
-
-
-def enthalpy(df, name):
-    df[name] = df[name] * 0.0004
-
+    day_index = calendar_table()["DOY"] - 1
+    dbt_day_ave = epw_df["DBT"].values.reshape(-1, 24).mean(axis=1)
+    rmt = running_mean_outdoor_temperatures(dbt_day_ave, alpha=0.9, n=7)
+    rmt = np.where(rmt > 40, 40.1, rmt)
+    rmt = np.where(rmt < 10, 9.9, rmt)
+    r = adaptive_ashrae(
+        tdb=dbt_day_ave,
+        tr=dbt_day_ave,
+        t_running_mean=rmt,
+        v=0.5,
+        limit_inputs=False,
+    )
 
-def convert_data(df, mapping_json):
-    df["adaptive_comfort"] = df["adaptive_comfort"] * 1.8 + 32
-    df["adaptive_cmf_80_low"] = df["adaptive_cmf_80_low"] * 1.8 + 32
-    df["adaptive_cmf_80_up"] = df["adaptive_cmf_80_up"] * 1.8 + 32
-    df["adaptive_cmf_90_low"] = df["adaptive_cmf_90_low"] * 1.8 + 32
-    df["adaptive_cmf_90_up"] = df["adaptive_cmf_90_up"] * 1.8 + 32
+    # broadcast the daily values to each hour of the day
+    epw_df["adaptive_comfort"] = r["tmp_cmf"][day_index]
+    epw_df["adaptive_cmf_80_low"] = r["tmp_cmf_80_low"][day_index]
+    epw_df["adaptive_cmf_80_up"] = r["tmp_cmf_80_up"][day_index]
+    epw_df["adaptive_cmf_90_low"] = r["tmp_cmf_90_low"][day_index]
+    epw_df["adaptive_cmf_90_up"] = r["tmp_cmf_90_up"][day_index]
+    epw_df["adaptive_cmf_rmt"] = rmt[day_index]
 
-    mapping_dict = json.loads(mapping_json)
-    for key in json.loads(mapping_json):
-        if "conversion_function" in mapping_dict[key]:
-            conversion_function_name = mapping_dict[key]["conversion_function"]
-            if conversion_function_name != None:
-                conversion_function = globals()[conversion_function_name]
-                conversion_function(df, key)
-    return json.dumps(mapping_dict)
+    return with_calendar(epw_df), location_info
 
 
 if __name__ == "__main__":
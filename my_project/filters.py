@@ -0,0 +1,49 @@
+import functools
+
+import numpy as np
+import pandas as pd
+
+from my_project.utils import determine_month_and_hour_filter
+from my_project.year_calendar import calendar_table
+
+
+def range_mask(values, min_val, max_val):
+    """Return the mask of the values kept by a range filter of the charts.
+
+    The values between min_val and max_val are kept, or the values outside of
+    max_val and min_val if min_val is greater than max_val. Missing values are kept.
+    """
+    values = np.asarray(values)
+    if min_val <= max_val:
+        return ~((values < min_val) | (values > max_val))
+    return ~((values >= max_val) & (values <= min_val))
+
+
+def month_hour_mask(month, hour, invert_month, invert_hour):
+    """Return the read-only mask of the hours of the year kept by the month and hour
+    filters of the charts, the rows of a dataset are in calendar order."""
+    return _month_hour_mask(
+        *determine_month_and_hour_filter(month, hour, invert_month, invert_hour)
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _month_hour_mask(start_month, end_month, start_hour, end_hour):
+    calendar = calendar_table()
+    mask = range_mask(calendar["month"], start_month, end_month) & range_mask(
+        calendar["hour"], start_hour, end_hour
+    )
+    mask.flags.writeable = False
+    return mask
+
+
+def masked(df, mask, columns):
+    """Return a dataframe with the columns of df where the values of columns are
+    missing outside of mask.
+
+    df is not modified, the other columns are shared with it and not copied.
+    """
+    data = {col: df[col] for col in df.columns}
+    for col in columns:
+        data[col] = df[col].where(mask)
+    return pd.DataFrame(data, index=df.index, copy=False)
@@ -0,0 +1,122 @@
+import logging
+import os
+import threading
+import time
+
+
+class Janitor:
+    """Garbage collector of the files of a cache directory.
+
+    A sweep deletes the files which have not been accessed for more than ttl
+    seconds and then the least recently accessed files until the total size of the
+    directory is below max_bytes. The last access time of a file is the most recent
+    of its access and modification times. Files are first renamed and then deleted,
+    so a reader either opens the complete file or does not find it, and readers that
+    already opened a file can keep reading it. Files for which skip(name) is true
+    are never deleted. Files for which temporary(name) is true, like the files of
+    writes in progress, are only deleted once they expire, so the files of crashed
+    writes are collected without deleting the files of running ones.
+    """
+
+    deleting_suffix = ".deleting"
+
+    def __init__(
+        self, cache_dir, max_bytes=1024 * 2**20, ttl=24 * 3600, skip=None, temporary=None
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.skip = skip
+        self.temporary = temporary
+        self.metrics = {
+            "entries": 0,
+            "bytes": 0,
+            "expired": 0,
+            "evicted": 0,
+            "sweeps": 0,
+            "last_sweep": None,
+        }
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _list_files(self):
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_file() or (self.skip and self.skip(entry.name)):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.name.endswith(self.deleting_suffix):
+                # left over by a sweep that was interrupted
+                self._delete(entry.path)
+                continue
+            last_access = max(stat.st_atime, stat.st_mtime)
+            temporary = bool(self.temporary and self.temporary(entry.name))
+            files.append((last_access, stat.st_size, entry.path, temporary))
+        return sorted(files)
+
+    def _delete(self, file_path):
+        if not file_path.endswith(self.deleting_suffix):
+            deleting_path = file_path + self.deleting_suffix
+            try:
+                os.replace(file_path, deleting_path)
+            except FileNotFoundError:
+                return False
+            file_path = deleting_path
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+        return True
+
+    def sweep(self):
+        """Delete the expired and least recently used files and return the metrics."""
+        with self._lock:
+            if not os.path.isdir(self.cache_dir):
+                return dict(self.metrics)
+            now = time.time()
+            files = self._list_files()
+            total_bytes = sum(size for _, size, _, _ in files)
+            kept = []
+            for last_access, size, file_path, temporary in files:
+                if self.ttl and now - last_access > self.ttl:
+                    if self._delete(file_path):
+                        self.metrics["expired"] += 1
+                    total_bytes -= size
+                elif not temporary:
+                    kept.append((size, file_path))
+
+            n_entries = len(kept)
+            for size, file_path in kept:
+                if not self.max_bytes or total_bytes <= self.max_bytes:
+                    break
+                if self._delete(file_path):
+                    self.metrics["evicted"] += 1
+                total_bytes -= size
+                n_entries -= 1
+
+            self.metrics.update(
+                entries=n_entries,
+                bytes=total_bytes,
+                sweeps=self.metrics["sweeps"] + 1,
+                last_sweep=now,
+            )
+            return dict(self.metrics)
+
+    def start(self, interval=600):
+        """Run a sweep every interval seconds in a daemon thread."""
+        if self._thread is not None:
+            return
+
+        def run():
+            while True:
+                try:
+                    self.sweep()
+                except OSError:
+                    logging.warning("Cache sweep of %s failed", self.cache_dir)
+                time.sleep(interval)
+
+        self._thread = threading.Thread(target=run, name="janitor", daemon=True)
+        self._thread.start()
@@ -243,7 +243,7 @@ def store():
                     dcc.Store(id="meta-store", storage_type="session"),
                     dcc.Store(id="url-store", storage_type="session"),
                     dcc.Store(id="si-ip-unit-store", storage_type="session"),
-                    dcc.Store(id="lines-store", storage_type="session"),
+                    dcc.Store(id="epw-hash-store", storage_type="session"),
                 ],
                 fullscreen=True,
                 type="dot",
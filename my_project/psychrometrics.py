@@ -0,0 +1,56 @@
+import numpy as np
+from pythermalcomfort.psychrometrics import p_sat, cp_air, cp_vapour, h_fg
+
+
+def t_wb(tdb, rh):
+    """Calculate the wet-bulb temperature [°C] using the Stull equation."""
+    return np.around(
+        tdb * np.arctan(0.151977 * np.sqrt(rh + 8.313659))
+        + np.arctan(tdb + rh)
+        - np.arctan(rh - 1.676331)
+        + 0.00391838 * rh**1.5 * np.arctan(0.023101 * rh)
+        - 4.686035,
+        1,
+    )
+
+
+def t_dp(tdb, rh):
+    """Calculate the dew point temperature [°C]."""
+    c = 257.14
+    b = 18.678
+    d = 234.5
+
+    gamma_m = np.log(rh / 100 * np.exp((b - tdb / d) * (tdb / (c + tdb))))
+
+    return np.around(c * gamma_m / (b - gamma_m), 1)
+
+
+def enthalpy(tdb, hr):
+    """Calculate the air enthalpy [J/kg dry air]."""
+    h_dry_air = cp_air * tdb
+    h_sat_vap = h_fg + cp_vapour * tdb
+    return np.around(h_dry_air + hr * h_sat_vap, 2)
+
+
+def psy_ta_rh(tdb, rh, p_atm=101325):
+    """Calculate the psychrometric values of air for arrays of dry bulb air
+    temperature [°C] and relative humidity [%].
+
+    Array-native version of pythermalcomfort.psychrometrics.psy_ta_rh, returns a
+    dictionary with the arrays p_sat, p_vap, hr, t_wb, t_dp and h.
+    """
+    tdb = np.asarray(tdb, dtype=float)
+    rh = np.asarray(rh, dtype=float)
+
+    p_saturation = p_sat(tdb)
+    p_vap = rh / 100 * p_saturation
+    hr = 0.62198 * p_vap / (p_atm - p_vap)
+
+    return {
+        "p_sat": p_saturation,
+        "p_vap": p_vap,
+        "hr": hr,
+        "t_wb": t_wb(tdb, rh),
+        "t_dp": t_dp(tdb, rh),
+        "h": enthalpy(tdb, hr),
+    }
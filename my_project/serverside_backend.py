@@ -0,0 +1,186 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from dash_extensions.enrich import FileSystemBackend
+
+from my_project.janitor import Janitor
+from my_project.shared_dataset import SharedDataset
+
+
+class TwoTierBackend(FileSystemBackend):
+    """Serverside backend that keeps the most recently used values deserialized in
+    memory in front of the file system backend.
+
+    The values are always written to disk, so they survive restarts and are shared
+    between workers, but reading a value which is in the memory tier does not need
+    to open and unpickle its file. The memory tier is an LRU cache limited to
+    max_memory_bytes. Its dataframes are shared read-only between callbacks, each
+    hit returns a new view of the cached dataframe instead of a copy. Values set
+    under a key which is already cached, like a content key, are not stored again.
+    """
+
+    def __init__(
+        self, cache_dir="file_system_backend", max_memory_bytes=256 * 2**20, **kwargs
+    ):
+        super().__init__(cache_dir, **kwargs)
+        self.max_memory_bytes = max_memory_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, ignore_expired=False):
+        if key is None:
+            return None
+        if key == self._fs_count_file:
+            return super().get(key, ignore_expired=ignore_expired)
+        self._touch(key)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _view(self._entries[key][0])
+            self.misses += 1
+
+        value = super().get(key, ignore_expired=ignore_expired)
+        if value is not None:
+            value = self._set_memory(key, value)
+        return value
+
+    def set(self, key, value, timeout=None, mgmt_element=False):
+        if not mgmt_element and self._has_memory(key):
+            # values set again under the same content key are the same value, the
+            # one which is already shared is kept instead of storing a new copy
+            if os.path.exists(self._get_filename(key)):
+                self._touch(key)
+                return True
+            return super().set(key, value, timeout=timeout)
+        result = super().set(key, value, timeout=timeout, mgmt_element=mgmt_element)
+        if not mgmt_element:
+            # the caller keeps the value it has set, the memory tier needs its own
+            self._set_memory(key, _own(value))
+        return result
+
+    def delete(self, key, mgmt_element=False):
+        with self._lock:
+            self._pop(key)
+        return super().delete(key, mgmt_element=mgmt_element)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+        return super().clear()
+
+    def stats(self):
+        """Return the hit and miss counters and the size of the memory tier."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "memory_bytes": self._memory_bytes,
+            }
+
+    def _touch(self, key):
+        # the janitor evicts the files which have not been used for the longest time
+        try:
+            os.utime(self._get_filename(key))
+        except OSError:
+            pass
+
+    def _has_memory(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return True
+        return False
+
+    def _is_count_file(self, name):
+        return name == os.path.basename(self._get_filename(self._fs_count_file))
+
+    def _is_transaction_file(self, name):
+        return name.endswith(self._fs_transaction_suffix)
+
+    def _pop(self, key):
+        if key in self._entries:
+            self._memory_bytes -= self._entries.pop(key)[1]
+
+    def _set_memory(self, key, value):
+        """Keep value in the memory tier and return the value to hand to callers."""
+        if not self.max_memory_bytes:
+            return value
+        if isinstance(value, pd.DataFrame):
+            value = SharedDataset(value)
+        nbytes = _nbytes(value)
+        with self._lock:
+            self._pop(key)
+            if nbytes > self.max_memory_bytes:
+                return _view(value)
+            self._entries[key] = (value, nbytes)
+            self._memory_bytes += nbytes
+            while self._memory_bytes > self.max_memory_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._memory_bytes -= evicted_bytes
+        return _view(value)
+
+
+def _view(value):
+    if isinstance(value, SharedDataset):
+        return value.view()
+    return _copy(value)
+
+
+def _own(value):
+    """Return a copy of value that the caller cannot modify anymore, the read-only
+    columns of dataframes shared by the dataset cache are not copied."""
+    if not isinstance(value, pd.DataFrame):
+        return _copy(value)
+    data = {
+        col: series if _is_read_only(series) else series.copy()
+        for col, series in value.items()
+    }
+    return pd.DataFrame(data, index=value.index, copy=False)
+
+
+def _is_read_only(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return _is_read_only(series.cat.codes)
+    values = series.to_numpy(copy=False)
+    return isinstance(values, np.ndarray) and not values.flags.writeable
+
+
+def _copy(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    return value
+
+
+def _nbytes(value):
+    if isinstance(value, SharedDataset):
+        return value.nbytes
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    return 0
+
+
+# the size of the directory is managed by the janitor instead of the file count
+# threshold of the file system cache
+serverside_backend = TwoTierBackend(
+    max_memory_bytes=int(os.environ.get("CLIMA_SERVERSIDE_MEMORY_MB", 256)) * 2**20,
+    threshold=0,
+)
+
+janitor = Janitor(
+    serverside_backend._path,
+    max_bytes=int(os.environ.get("CLIMA_SERVERSIDE_DISK_MB", 1024)) * 2**20,
+    ttl=float(os.environ.get("CLIMA_SERVERSIDE_TTL_HOURS", 24)) * 3600,
+    skip=serverside_backend._is_count_file,
+    temporary=serverside_backend._is_transaction_file,
+)
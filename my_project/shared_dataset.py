@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+
+def _read_only(series):
+    """Return the values of a numeric or categorical series in a read-only array
+    which shares their memory, or None for the other types of columns."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = _read_only(series.cat.codes)
+        return pd.Categorical.from_codes(codes, dtype=series.dtype)
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf":
+        values = series.to_numpy(copy=False).view()
+        values.flags.writeable = False
+        return values
+    return None
+
+
+class SharedDataset:
+    """Dataframe shared between callbacks and threads without defensive copies.
+
+    The numeric and categorical columns are kept in read-only arrays and each
+    caller works on its own view of them, a shallow dataframe built on the same
+    arrays. Writing into these columns in place raises a ValueError. The columns a
+    caller adds or replaces, and its copy of the few object and datetime columns,
+    only exist in its view.
+    """
+
+    def __init__(self, df):
+        data = {col: _read_only(df[col]) for col in df.columns}
+        self._copied = [col for col, values in data.items() if values is None]
+        for col in self._copied:
+            data[col] = df[col]
+        self._df = pd.DataFrame(data, index=df.index, copy=False)
+        self.nbytes = int(self._df.memory_usage(index=True, deep=True).sum())
+
+    def view(self):
+        """Return a new dataframe on the shared columns."""
+        df = self._df.copy(deep=False)
+        for col in self._copied:
+            df[col] = df[col].copy()
+        return df
@@ -0,0 +1,130 @@
+import numpy as np
+
+# projected area factor tables from ASHRAE 55 2020 Appendix C, rows are the solar
+# horizontal angle relative to the front of the person (SHARP) and columns are the
+# solar altitude
+alt_range = np.array([0, 15, 30, 45, 60, 75, 90])
+az_range = np.array([0, 15, 30, 45, 60, 75, 90, 105, 120, 135, 150, 165, 180])
+fp_tables = {
+    "standing": np.array(
+        [
+            [0.35, 0.35, 0.314, 0.258, 0.206, 0.144, 0.082],
+            [0.342, 0.342, 0.31, 0.252, 0.2, 0.14, 0.082],
+            [0.33, 0.33, 0.3, 0.244, 0.19, 0.132, 0.082],
+            [0.31, 0.31, 0.275, 0.228, 0.175, 0.124, 0.082],
+            [0.283, 0.283, 0.251, 0.208, 0.16, 0.114, 0.082],
+            [0.252, 0.252, 0.228, 0.188, 0.15, 0.108, 0.082],
+            [0.23, 0.23, 0.214, 0.18, 0.148, 0.108, 0.082],
+            [0.242, 0.242, 0.222, 0.18, 0.153, 0.112, 0.082],
+            [0.274, 0.274, 0.245, 0.203, 0.165, 0.116, 0.082],
+            [0.304, 0.304, 0.27, 0.22, 0.174, 0.121, 0.082],
+            [0.328, 0.328, 0.29, 0.234, 0.183, 0.125, 0.082],
+            [0.344, 0.344, 0.304, 0.244, 0.19, 0.128, 0.082],
+            [0.347, 0.347, 0.308, 0.246, 0.191, 0.128, 0.082],
+        ]
+    ),
+    "seated": np.array(
+        [
+            [0.29, 0.324, 0.305, 0.303, 0.262, 0.224, 0.177],
+            [0.292, 0.328, 0.294, 0.288, 0.268, 0.227, 0.177],
+            [0.288, 0.332, 0.298, 0.29, 0.264, 0.222, 0.177],
+            [0.274, 0.326, 0.294, 0.289, 0.252, 0.214, 0.177],
+            [0.254, 0.308, 0.28, 0.276, 0.241, 0.202, 0.177],
+            [0.23, 0.282, 0.262, 0.26, 0.233, 0.193, 0.177],
+            [0.216, 0.26, 0.248, 0.244, 0.22, 0.186, 0.177],
+            [0.234, 0.258, 0.236, 0.227, 0.208, 0.18, 0.177],
+            [0.262, 0.26, 0.224, 0.208, 0.196, 0.176, 0.177],
+            [0.28, 0.26, 0.21, 0.192, 0.184, 0.17, 0.177],
+            [0.298, 0.256, 0.194, 0.174, 0.168, 0.168, 0.177],
+            [0.306, 0.25, 0.18, 0.156, 0.156, 0.166, 0.177],
+            [0.3, 0.24, 0.168, 0.152, 0.152, 0.164, 0.177],
+        ]
+    ),
+}
+fp_tables["supine"] = fp_tables["standing"]
+
+
+def find_span(arr, x):
+    """Return the index of the interval of arr that contains each value of x."""
+    return np.clip(np.searchsorted(arr, x, side="left") - 1, 0, len(arr) - 2)
+
+
+def transpose_sharp_altitude(sharp, altitude):
+    """Convert sharp and altitude for a supine person."""
+    altitude_new = np.degrees(
+        np.arcsin(np.sin(np.radians(np.abs(sharp - 90))) * np.cos(np.radians(altitude)))
+    )
+    sharp = np.degrees(
+        np.arctan(np.sin(np.radians(sharp)) * np.tan(np.radians(90 - altitude)))
+    )
+    return np.around(sharp, 3), np.around(altitude_new, 3)
+
+
+def solar_gain(
+    sol_altitude,
+    sharp,
+    sol_radiation_dir,
+    sol_transmittance,
+    f_svv,
+    f_bes,
+    asw=0.7,
+    posture="seated",
+    floor_reflectance=0.6,
+):
+    """Calculate the solar gain to the human body for arrays of inputs.
+
+    Array-native version of pythermalcomfort.models.solar_gain, the inputs can be
+    scalars or arrays that broadcast against each other. Returns a dictionary with
+    the effective radiant field 'erf' [W/m2] and the delta mean radiant temperature
+    'delta_mrt' [°C] as arrays.
+    """
+    posture = posture.lower()
+    if posture not in ["standing", "supine", "seated"]:
+        raise ValueError("Posture has to be either standing, supine or seated")
+
+    sol_altitude = np.asarray(sol_altitude, dtype=float)
+    sharp = np.asarray(sharp, dtype=float)
+    sol_radiation_dir = np.asarray(sol_radiation_dir, dtype=float)
+
+    deg_to_rad = 0.0174532925
+    hr = 6
+    i_diff = 0.2 * sol_radiation_dir
+
+    if posture == "supine":
+        sharp, sol_altitude = transpose_sharp_altitude(sharp, sol_altitude)
+    sharp, sol_altitude = np.broadcast_arrays(sharp, sol_altitude)
+
+    # bilinear interpolation of the projected area factor
+    fp_table = fp_tables[posture]
+    alt_i = find_span(alt_range, sol_altitude)
+    az_i = find_span(az_range, sharp)
+    alt1 = alt_range[alt_i]
+    alt2 = alt_range[alt_i + 1]
+    az1 = az_range[az_i]
+    az2 = az_range[az_i + 1]
+
+    fp = fp_table[az_i, alt_i] * (az2 - sharp) * (alt2 - sol_altitude)
+    fp += fp_table[az_i + 1, alt_i] * (sharp - az1) * (alt2 - sol_altitude)
+    fp += fp_table[az_i, alt_i + 1] * (az2 - sharp) * (sol_altitude - alt1)
+    fp += fp_table[az_i + 1, alt_i + 1] * (sharp - az1) * (sol_altitude - alt1)
+    fp /= (az2 - az1) * (alt2 - alt1)
+
+    f_eff = 0.696 if posture == "seated" else 0.725
+    lw_abs = 0.95
+
+    e_diff = f_eff * f_svv * 0.5 * sol_transmittance * i_diff
+    e_direct = f_eff * fp * sol_transmittance * f_bes * sol_radiation_dir
+    e_reflected = (
+        f_eff
+        * f_svv
+        * 0.5
+        * sol_transmittance
+        * (sol_radiation_dir * np.sin(sol_altitude * deg_to_rad) + i_diff)
+        * floor_reflectance
+    )
+
+    e_solar = e_diff + e_direct + e_reflected
+    erf = e_solar * (asw / lw_abs)
+    d_mrt = erf / (hr * f_eff)
+
+    return {"erf": np.around(erf, 1), "delta_mrt": np.around(d_mrt, 1)}
@@ -0,0 +1,122 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from my_project.column_store import ColumnStore
+
+catalog_dir = os.environ.get("CLIMA_CATALOG_DIR", "./assets/data/catalog")
+energyplus_file = "./assets/data/epw_location.json"
+one_building_file = "./assets/data/one_building.csv"
+# the value of the source column is the index of the source in this list
+sources = ["EnergyPlus", "Climate.OneBuilding.Org"]
+
+# loaded catalogs by directory, with the time when they were written
+_catalogs = {}
+_catalog_lock = threading.Lock()
+
+
+def read_energyplus_stations(file_path=energyplus_file):
+    """Return the stations listed in the GeoJSON file of the EnergyPlus EPW files."""
+    with open(file_path, encoding="utf8") as data_file:
+        features = json.load(data_file)["features"]
+
+    coordinates = np.array([f["geometry"]["coordinates"] for f in features], float)
+    epw_links = pd.Series([f["properties"]["epw"] for f in features])
+    return pd.DataFrame(
+        {
+            "name": [f["properties"]["title"] for f in features],
+            "lat": coordinates[:, 1],
+            "lon": coordinates[:, 0],
+            "elevation": np.nan,
+            "time_zone": np.nan,
+            "source": np.uint8(0),
+            "url": epw_links.str.extract(r"href=([^>]+)>", expand=False),
+            "period": "",
+            "heating_db": np.nan,
+            "cooling_db": np.nan,
+        }
+    )
+
+
+def read_one_building_stations(file_path=one_building_file):
+    """Return the stations in the file written by import_one_building_files."""
+    df = pd.read_csv(file_path, compression="gzip")
+
+    def to_float(col):
+        return pd.to_numeric(
+            df[col].astype(str).str.extract(r"(-?[\d.]+)", expand=False),
+            errors="coerce",
+        )
+
+    return pd.DataFrame(
+        {
+            "name": df["name"],
+            "lat": df["lat"].astype(float),
+            "lon": df["lon"].astype(float),
+            "elevation": to_float("elevation (m)"),
+            "time_zone": to_float("time zone (GMT)"),
+            "source": np.uint8(1),
+            "url": df["Source"].str.extract(r"href=(.+?) style=", expand=False),
+            "period": df["period"].fillna(""),
+            "heating_db": to_float("99% Heating DB"),
+            "cooling_db": to_float("1% Cooling DB "),
+        }
+    )
+
+
+def build_catalog(cache_dir=catalog_dir):
+    """Compile the EnergyPlus and Climate.OneBuilding.Org station lists into a
+    single columnar catalog and return it."""
+    df = pd.concat(
+        [read_energyplus_stations(), read_one_building_stations()], ignore_index=True
+    )
+    df["name"] = df["name"].fillna("").astype(str)
+    df["url"] = df["url"].fillna("").astype(str)
+    df["period"] = df["period"].astype(str)
+    ColumnStore(cache_dir).write("stations", df, {"sources": sources}, replace=True)
+    return df
+
+
+def _is_outdated(store):
+    modified = store.modified("stations")
+    if modified is None:
+        return True
+    return any(
+        os.path.getmtime(file_path) > modified
+        for file_path in [energyplus_file, one_building_file]
+    )
+
+
+def load_catalog(cache_dir=catalog_dir, check_sources=False):
+    """Return the station catalog, each row is a station and its index is the
+    station id.
+
+    The catalog is memory-mapped from cache_dir and it is built first if it does not
+    exist. The station files are only compared with the catalog when it is read
+    again from cache_dir or if check_sources is True, and it is rebuilt if it is
+    older than them.
+    """
+    store = ColumnStore(cache_dir)
+    modified = store.modified("stations")
+    loaded = cache_dir in _catalogs and _catalogs[cache_dir][0] == modified
+    if loaded and not check_sources:
+        return _catalogs[cache_dir][1]
+
+    with _catalog_lock:
+        if _is_outdated(store):
+            build_catalog(cache_dir)
+        elif loaded:
+            return _catalogs[cache_dir][1]
+        value = store.read("stations")
+        if value is None:
+            raise FileNotFoundError(f"Could not read the catalog in {cache_dir}")
+        _catalogs[cache_dir] = (store.modified("stations"), value[0])
+    return value[0]
+
+
+if __name__ == "__main__":
+    catalog = build_catalog()
+    print(f"Saved {len(catalog)} stations in {catalog_dir}")
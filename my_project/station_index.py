@@ -0,0 +1,76 @@
+import threading
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from my_project.station_catalog import load_catalog, sources
+
+earth_radius_km = 6371.0088
+
+_index = {"catalog": None, "index": None}
+_index_lock = threading.Lock()
+
+
+def unit_vectors(lat, lon):
+    """Return the coordinates of points on the unit sphere from lat and lon [°]."""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    return np.stack(
+        [np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1
+    )
+
+
+class StationIndex:
+    """KD-tree of the stations of a catalog on unit-sphere coordinates.
+
+    The euclidean distance between two points on the unit sphere (the chord)
+    increases with their great-circle distance, so the nearest stations in the tree
+    are the nearest stations on the Earth.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.tree = cKDTree(unit_vectors(catalog["lat"], catalog["lon"]))
+
+    def nearest(self, lat, lon, k=5):
+        """Return the ids of the k stations nearest to lat and lon and their
+        great-circle distances [km]."""
+        k = min(k, len(self.catalog))
+        chord, ix = self.tree.query(unit_vectors(lat, lon), k=k)
+        chord, ix = np.atleast_1d(chord), np.atleast_1d(ix)
+        distance = 2 * earth_radius_km * np.arcsin(np.minimum(chord / 2, 1))
+        return self.catalog.index[ix].to_numpy(), distance
+
+
+def station_index():
+    """Return the index of the current station catalog."""
+    catalog = load_catalog()
+    if _index["catalog"] is not catalog:
+        with _index_lock:
+            if _index["catalog"] is not catalog:
+                _index["index"] = StationIndex(catalog)
+                _index["catalog"] = catalog
+    return _index["index"]
+
+
+def nearest_stations(lat, lon, k=5):
+    """Return the k stations nearest to lat and lon as a list of dictionaries, sorted
+    by their distance [km] from the point."""
+    index = station_index()
+    ids, distance = index.nearest(lat, lon, k)
+    columns = {
+        col: index.catalog[col].to_numpy()[ids]
+        for col in ["name", "lat", "lon", "source", "url"]
+    }
+    return [
+        {
+            "id": int(ids[ix]),
+            "name": columns["name"][ix],
+            "lat": float(columns["lat"][ix]),
+            "lon": float(columns["lon"][ix]),
+            "source": sources[columns["source"][ix]],
+            "url": columns["url"][ix],
+            "distance_km": round(float(distance[ix]), 3),
+        }
+        for ix in range(len(ids))
+    ]
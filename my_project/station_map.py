@@ -0,0 +1,249 @@
+import threading
+import time
+
+import numpy as np
+
+from my_project.station_catalog import load_catalog
+
+# stations are clustered on a grid of cells_per_tile x cells_per_tile cells for each
+# map tile up to max_cluster_zoom, above it all the stations in view are shown
+max_cluster_zoom = 10
+cells_per_tile = 8
+initial_zoom = 2
+map_height = 500
+energyplus_color = "#3a0ca3"
+one_building_color = "#4895ef"
+
+# seconds between two checks of the station catalog
+station_map_check_interval = 60
+_station_map = {"catalog": None, "checked": 0, "clusters": None, "figure": None}
+_station_map_lock = threading.Lock()
+
+
+def web_mercator(lat, lon):
+    """Return the web mercator coordinates of lat and lon [°] between 0 and 1."""
+    lat = np.clip(lat, -85.0511, 85.0511)
+    x = (np.asarray(lon, dtype=float) + 180) / 360
+    y = (1 - np.log(np.tan(np.radians(lat)) + 1 / np.cos(np.radians(lat))) / np.pi) / 2
+    return np.clip(x, 0, 1 - 1e-12), np.clip(y, 0, 1 - 1e-12)
+
+
+class StationClusters:
+    """Grid clusters of the stations of a catalog for each map zoom level.
+
+    At each zoom level the stations are grouped by the cell of a regular web
+    mercator grid they fall in. Each cluster has the mean position of its stations,
+    their number and the id of its first station.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.lat = catalog["lat"].to_numpy()
+        self.lon = catalog["lon"].to_numpy()
+        x, y = web_mercator(self.lat, self.lon)
+        ids = np.arange(len(catalog))
+
+        self.levels = []
+        for zoom in range(max_cluster_zoom + 1):
+            n = cells_per_tile * 2**zoom
+            cell = np.floor(y * n).astype(np.int64) * n + np.floor(x * n)
+            _, inverse, count = np.unique(cell, return_inverse=True, return_counts=True)
+            first = np.full(len(count), len(catalog))
+            np.minimum.at(first, inverse, ids)
+            self.levels.append(
+                {
+                    "lat": np.bincount(inverse, weights=self.lat) / count,
+                    "lon": np.bincount(inverse, weights=self.lon) / count,
+                    "count": count,
+                    "first": first,
+                }
+            )
+
+    def in_view(self, zoom, bounds=None):
+        """Return the positions of the single stations and the clusters, with their
+        sizes, inside bounds (west, south, east, north) at zoom."""
+        zoom = int(np.clip(np.floor(zoom), 0, max_cluster_zoom + 1))
+        if zoom > max_cluster_zoom:
+            mask = _in_bounds(self.lat, self.lon, bounds)
+            return np.flatnonzero(mask), None
+
+        level = self.levels[zoom]
+        mask = _in_bounds(level["lat"], level["lon"], bounds)
+        single = mask & (level["count"] == 1)
+        clustered = mask & (level["count"] > 1)
+        clusters = {key: values[clustered] for key, values in level.items()}
+        return level["first"][single], clusters
+
+
+def _in_bounds(lat, lon, bounds):
+    if bounds is None:
+        return np.ones(len(lat), dtype=bool)
+    west, south, east, north = bounds
+    lat_mask = (lat >= south) & (lat <= north)
+    if east - west >= 360:
+        return lat_mask
+    west = (west + 180) % 360 - 180
+    east = (east + 180) % 360 - 180
+    if west <= east:
+        return lat_mask & (lon >= west) & (lon <= east)
+    # the view crosses the antimeridian
+    return lat_mask & ((lon >= west) | (lon <= east))
+
+
+def _customdata(*columns):
+    return np.stack([np.asarray(col, dtype=object) for col in columns], axis=-1)
+
+
+def _format(values, template):
+    return [template.format(value) if value == value else "" for value in values]
+
+
+def _station_traces(catalog, station_ids):
+    stations = catalog.iloc[station_ids]
+    energyplus = stations[stations["source"] == 0]
+    one_building = stations[stations["source"] == 1]
+    hover_start = "<b>%{hovertext}</b><br><br>lat=%{lat}<br>lon=%{lon}<br>"
+
+    return [
+        {
+            "type": "scattermapbox",
+            "lat": energyplus["lat"].to_numpy() + 0.01,
+            "lon": energyplus["lon"].to_numpy(),
+            "hovertext": energyplus["name"].to_numpy(),
+            "customdata": _customdata(
+                energyplus.index,
+                "<a href=" + energyplus["url"] + ">EnergyPlus</a>",
+            ),
+            "hovertemplate": hover_start + "Source=%{customdata[1]}<extra></extra>",
+            "marker": {"color": energyplus_color},
+            "mode": "markers",
+            "showlegend": False,
+        },
+        {
+            "type": "scattermapbox",
+            "lat": one_building["lat"].to_numpy(),
+            "lon": one_building["lon"].to_numpy(),
+            "hovertext": one_building["name"].to_numpy(),
+            "customdata": _customdata(
+                one_building.index,
+                one_building["period"],
+                _format(one_building["elevation"], "{:.0f}"),
+                _format(one_building["time_zone"], "{:g}"),
+                _format(one_building["heating_db"], "{:.1f} C"),
+                _format(one_building["cooling_db"], "{:.1f} C"),
+                "<a href="
+                + one_building["url"]
+                + ' style="color: #fff">Climate.OneBuilding.Org</a>',
+            ),
+            "hovertemplate": hover_start
+            + "period=%{customdata[1]}<br>elevation (m)=%{customdata[2]}<br>"
+            + "time zone (GMT)=%{customdata[3]}<br>"
+            + "99% Heating DB=%{customdata[4]}<br>1% Cooling DB =%{customdata[5]}<br>"
+            + "Source=%{customdata[6]}<extra></extra>",
+            "marker": {"color": one_building_color},
+            "mode": "markers",
+            "showlegend": False,
+        },
+    ]
+
+
+def _cluster_trace(clusters):
+    count = clusters["count"]
+    return {
+        "type": "scattermapbox",
+        "lat": clusters["lat"],
+        "lon": clusters["lon"],
+        # clusters have a negative station id so that clicks on them are ignored
+        "customdata": np.full((len(count), 1), -1),
+        "text": count,
+        "hovertemplate": "%{text} weather files<br>zoom in to select one"
+        + "<extra></extra>",
+        "marker": {
+            "color": one_building_color,
+            "opacity": 0.7,
+            "size": np.clip(6 + 3 * np.log2(count), 8, 30),
+        },
+        "mode": "markers",
+        "showlegend": False,
+    }
+
+
+def station_map_figure(clusters, zoom=initial_zoom, center=None, bounds=None):
+    """Return the map figure, as a dictionary, with the clusters and stations in
+    bounds at zoom."""
+    catalog = clusters.catalog
+    station_ids, in_view = clusters.in_view(zoom, bounds)
+    data = _station_traces(catalog, station_ids)
+    if in_view is not None:
+        data.insert(0, _cluster_trace(in_view))
+    if center is None:
+        center = {"lat": float(clusters.lat.mean()), "lon": float(clusters.lon.mean())}
+
+    for trace in data:
+        for key, value in trace.items():
+            if isinstance(value, np.ndarray):
+                trace[key] = value.tolist()
+        if "size" in trace["marker"]:
+            trace["marker"]["size"] = trace["marker"]["size"].tolist()
+    return {
+        "data": data,
+        "layout": {
+            "mapbox": {"style": "carto-positron", "center": center, "zoom": zoom},
+            "margin": {"r": 0, "t": 0, "l": 0, "b": 0},
+            "height": map_height,
+            # keep the view of the user when the figure is updated
+            "uirevision": "station-map",
+        },
+    }
+
+
+def station_clusters():
+    """Return the clusters of the current station catalog."""
+    now = time.monotonic()
+    if (
+        _station_map["clusters"] is not None
+        and now - _station_map["checked"] < station_map_check_interval
+    ):
+        return _station_map["clusters"]
+
+    with _station_map_lock:
+        catalog = load_catalog(check_sources=True)
+        if _station_map["catalog"] is not catalog:
+            clusters = StationClusters(catalog)
+            _station_map["figure"] = station_map_figure(clusters)
+            _station_map["clusters"] = clusters
+            _station_map["catalog"] = catalog
+        _station_map["checked"] = now
+    return _station_map["clusters"]
+
+
+def plot_location_epw_files():
+    """Return the figure of the map of the available EPW files at the initial zoom.
+
+    The figure is built only once and then served from memory as a plain JSON
+    dictionary, it is rebuilt only if the station catalog changes.
+    """
+    station_clusters()
+    return _station_map["figure"]
+
+
+def view_from_relayout(relayout_data):
+    """Return the zoom, center and bounds (west, south, east, north) of the map
+    from its relayoutData or None if they are not in it."""
+    try:
+        zoom = float(relayout_data["mapbox.zoom"])
+        center = relayout_data["mapbox.center"]
+        corners = np.array(relayout_data["mapbox._derived"]["coordinates"], float)
+    except (KeyError, TypeError, ValueError):
+        return None
+    lon, lat = corners[:, 0], corners[:, 1]
+    # add a margin so that panning a little does not show empty areas
+    margin_lon = (lon.max() - lon.min()) / 4
+    margin_lat = (lat.max() - lat.min()) / 4
+    bounds = (
+        lon.min() - margin_lon,
+        lat.min() - margin_lat,
+        lon.max() + margin_lon,
+        lat.max() + margin_lat,
+    )
+    return zoom, center, bounds
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+
+from my_project.units import ip_column_groups, ip_conversions
+from my_project.year_calendar import calendar_table
+
+# statistics of the cube, named as in DataFrame.describe
+statistics = ["count", "mean", "std", "min", "1%", "25%", "50%", "75%", "99%", "max"]
+percentiles = [1, 25, 50, 75, 99]
+
+# rows of the cube table of each level of aggregation and the shape of its groups
+levels = {
+    "month_hour": (slice(0, 288), (12, 24)),
+    "doy": (slice(288, 653), (365,)),
+    "month": (slice(653, 665), (12,)),
+    "year": (slice(665, 666), ()),
+}
+
+
+def _describe(values, axis):
+    """Return the statistics of values along axis, stacked along a new first axis.
+
+    The NaN aware functions are much slower so they are only used if needed."""
+    if np.isnan(values).any():
+        count = np.sum(~np.isnan(values), axis=axis)
+        mean, std = np.nanmean, np.nanstd
+        min_, max_, percentile = np.nanmin, np.nanmax, np.nanpercentile
+    else:
+        count = np.full(np.delete(values.shape, axis), values.shape[axis])
+        mean, std, min_, max_, percentile = (
+            np.mean,
+            np.std,
+            np.min,
+            np.max,
+            np.percentile,
+        )
+    return np.concatenate(
+        [
+            [count, mean(values, axis=axis), std(values, axis=axis, ddof=1)],
+            [min_(values, axis=axis)],
+            percentile(values, percentiles, axis=axis),
+            [max_(values, axis=axis)],
+        ]
+    )
+
+
+def _cube(values):
+    """Return the statistics of the columns of a (8760, n) array for every group of
+    every level, as an array of shape (statistics, groups, n)."""
+    month_bounds = np.searchsorted(calendar_table()["month"], np.arange(1, 14))
+    month_hour, month = [], []
+    for start, end in zip(month_bounds[:-1], month_bounds[1:]):
+        month_values = values[start:end]
+        days = month_values.reshape(-1, 24, values.shape[1])
+        month_hour.append(_describe(days, axis=0))
+        month.append(_describe(month_values, axis=0))
+    return np.concatenate(
+        [
+            np.concatenate(month_hour, axis=1),
+            _describe(values.reshape(-1, 24, values.shape[1]), axis=1),
+            np.stack(month, axis=1),
+            _describe(values, axis=0)[:, None],
+        ],
+        axis=1,
+    )
+
+
+def stats_cube(df):
+    """Return the statistics cube of the numeric and numeric categorical columns of
+    a dataset.
+
+    The count, mean, standard deviation, min, max and percentiles of each column are
+    computed per month and hour, per day of the year, per month and for the whole
+    year. The dataset must have one row per hour of the year in calendar order.
+    """
+    columns = [
+        col
+        for col in df.columns
+        if df[col].dtype == float
+        or (
+            isinstance(df[col].dtype, pd.CategoricalDtype)
+            and pd.api.types.is_numeric_dtype(df[col].cat.categories)
+        )
+    ]
+    values = df[columns].astype(float).to_numpy()
+    # the columns with missing values are processed apart, with the slower NaN
+    # aware functions
+    has_nan = np.isnan(values).any(axis=0)
+    cube = np.empty((len(statistics), levels["year"][0].stop, len(columns)))
+    with np.errstate(all="ignore"):
+        for mask in (has_nan, ~has_nan):
+            if mask.any():
+                cube[:, :, mask] = _cube(values[:, mask])
+
+    data = {
+        f"{col}:{stat}": cube[ix_stat, :, ix_col]
+        for ix_col, col in enumerate(columns)
+        for ix_stat, stat in enumerate(statistics)
+    }
+    return StatsCube(pd.DataFrame(data))
+
+
+class StatsCube:
+    """Statistics of the numeric columns of a dataset at several levels of
+    aggregation, built once per dataset so that charts only slice arrays.
+
+    The table has one row per group, the groups of each level are listed in levels,
+    and one column per column and statistic named 'column:statistic'.
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+    def get(self, col, stat, level):
+        """Return the statistic of a column for each group of level, the month and
+        hour level has shape (12, 24)."""
+        rows, shape = levels[level]
+        return self.table[f"{col}:{stat}"].to_numpy()[rows].reshape(shape)
+
+    def describe(self, col, level):
+        """Return a dataframe with the statistics of a column for each group of
+        level, as DataFrame.describe."""
+        rows, _ = levels[level]
+        table = self.table.iloc[rows][[f"{col}:{stat}" for stat in statistics]]
+        return table.set_axis(statistics, axis=1).reset_index(drop=True)
+
+    def to_units(self, si_ip):
+        """Return the cube in the 'si' or 'ip' unit system, the cube must be in SI
+        units."""
+        if si_ip != "ip":
+            return self
+        scale = np.ones(len(self.table.columns))
+        offset = np.zeros(len(self.table.columns))
+        for name, group in ip_column_groups.items():
+            for col in group:
+                for stat in statistics[1:]:
+                    key = f"{col}:{stat}"
+                    if key in self.table.columns:
+                        ix = self.table.columns.get_loc(key)
+                        scale[ix], offset[ix] = ip_conversions[name]
+                        # the standard deviation does not depend on the offset
+                        if stat == "std":
+                            offset[ix] = 0
+        values = self.table.to_numpy() * scale + offset
+        return StatsCube(pd.DataFrame(values, columns=self.table.columns))
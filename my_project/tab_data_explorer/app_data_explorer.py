@@ -4,6 +4,7 @@ from dash import dcc
 from dash import html
 from dash.exceptions import PreventUpdate
 from my_project.utils import (
+    dataset_stats,
     generate_chart_name,
     generate_custom_inputs,
     generate_custom_inputs_explorer,
@@ -28,6 +29,7 @@ from my_project.global_scheme import (
 )
 from dash.dependencies import Input, Output, State
 
+from my_project.filters import masked, month_hour_mask, range_mask
 from my_project.tab_data_explorer.charts_data_explorer import (
     custom_heatmap,
     two_var_graph,
@@ -38,7 +40,6 @@ from my_project.template_graphs import (
     yearly_profile,
     daily_profile,
     barchart,
-    filter_df_by_month_and_hour,
 )
 
 from app import app
@@ -624,9 +625,10 @@ def layout_data_explorer():
         State("df-store", "data"),
         State("meta-store", "data"),
         State("si-ip-unit-store", "data"),
+        State("epw-hash-store", "data"),
     ],
 )
-def update_tab_yearly(ts, var, global_local, df, meta, si_ip):
+def update_tab_yearly(ts, var, global_local, df, meta, si_ip, epw_hash):
     """Update the contents of tab size. Passing in the info from the dropdown and the general info."""
 
     if df[var].mean() == 99990.0:
@@ -641,7 +643,9 @@ def update_tab_yearly(ts, var, global_local, df, meta, si_ip):
         units = generate_units(si_ip)
         return dcc.Graph(
             config=generate_chart_name("yearly_explore", meta, custom_inputs, units),
-            figure=yearly_profile(df, var, global_local, si_ip),
+            figure=yearly_profile(
+                dataset_stats(epw_hash, si_ip), var, global_local, si_ip
+            ),
         )
 
 
@@ -656,16 +660,18 @@ def update_tab_yearly(ts, var, global_local, df, meta, si_ip):
         State("df-store", "data"),
         State("meta-store", "data"),
         State("si-ip-unit-store", "data"),
+        State("epw-hash-store", "data"),
     ],
 )
-def update_tab_daily(ts, var, global_local, df, meta, si_ip):
+def update_tab_daily(ts, var, global_local, df, meta, si_ip, epw_hash):
     """Update the contents of tab size. Passing in the info from the dropdown and the general info."""
     custom_inputs = generate_custom_inputs(var)
     units = generate_units(si_ip)
+    stats = dataset_stats(epw_hash, si_ip)
     return (
         dcc.Graph(
             config=generate_chart_name("daily_explore", meta, custom_inputs, units),
-            figure=daily_profile(df, var, global_local, si_ip),
+            figure=daily_profile(df, stats, var, global_local, si_ip),
         ),
     )
 
@@ -742,9 +748,10 @@ def update_heatmap(
     invert_hour,
     si_ip,
 ):
-    df = filter_df_by_month_and_hour(
-        df, time_filter, month, hour, invert_month, invert_hour, var
-    )
+    if time_filter:
+        df = masked(df, month_hour_mask(month, hour, invert_month, invert_hour), [var])
+    if data_filter:
+        df = masked(df, range_mask(df[filter_var], min_val, max_val), [var])
     data_filter_info = [data_filter, filter_var, min_val, max_val]
 
     start_month, end_month, start_hour, end_hour = determine_month_and_hour_filter(
@@ -856,9 +863,8 @@ def update_more_charts(
     # if (min_val3 is None or max_val3 is None) and data_filter3:
     #     raise PreventUpdate
 
-    df = filter_df_by_month_and_hour(
-        df, time_filter, month, hour, invert_month, invert_hour, df.columns
-    )
+    if time_filter:
+        df = df.loc[month_hour_mask(month, hour, invert_month, invert_hour)]
 
     data_filter_info = [data_filter, data_filter_var, min_val, max_val]
     if data_filter and (min_val is None or max_val is None):
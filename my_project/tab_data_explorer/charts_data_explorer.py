@@ -1,15 +1,16 @@
 from math import ceil, floor
 
 import json
-import numpy as np
 import math
 import plotly.express as px
 import plotly.graph_objects as go
+from my_project.filters import range_mask
 from my_project.global_scheme import template, mapping_dictionary, month_lst
+from my_project.template_graphs import heatmap_axes, heatmap_trace
 
 
 def custom_heatmap(df, global_local, var, time_filter_info, data_filter_info, si_ip):
-    """Return the customizable heatmap."""
+    """Return the customizable heatmap, df must already be filtered."""
     time_filter = time_filter_info[0]
     start_month = time_filter_info[1][0]
     end_month = time_filter_info[1][1]
@@ -20,14 +21,6 @@ def custom_heatmap(df, global_local, var, time_filter_info, data_filter_info, si
     min_val = data_filter_info[2]
     max_val = data_filter_info[3]
 
-    if data_filter:
-        if min_val <= max_val:
-            mask = (df[filter_var] < min_val) | (df[filter_var] > max_val)
-            df[var][mask] = None
-        else:
-            mask = (df[filter_var] >= max_val) & (df[filter_var] <= min_val)
-            df[var][mask] = None
-
     if df.dropna(subset=[var]).shape[0] == 0:
         return None
 
@@ -60,37 +53,25 @@ def custom_heatmap(df, global_local, var, time_filter_info, data_filter_info, si
         )
 
     fig = go.Figure(
-        data=go.Heatmap(
-            y=df["hour"],
-            x=df["DOY"],
-            z=df[var],
-            colorscale=var_color,
-            zmin=range_z[0],
-            zmax=range_z[1],
+        data=heatmap_trace(
+            df[var],
+            var,
+            var_unit,
+            var_color,
+            range_z,
             connectgaps=False,
             hoverongaps=False,
-            customdata=np.stack((df["month_names"], df["day"]), axis=-1),
-            hovertemplate=(
-                "<b>"
-                + var
-                + ": %{z:.2f} "
-                + var_unit
-                + "</b><br>"
-                + "Month: %{customdata[0]}<br>"
-                + "Day: %{customdata[1]}<br>"
-                + "Hour: %{y}:00<br>"
-            ),
-            name="",
-            colorbar=dict(title=var_unit),
         )
     )
+    days, _ = heatmap_axes()
     fig.update_layout(
         template=template,
         title=title,
         xaxis_nticks=53,
         yaxis_nticks=13,
         yaxis=dict(range=(1, 24)),
-        xaxis=dict(range=(1, 365)),
+        # the days are dates, the ticks show the day of the year
+        xaxis=dict(range=(days[0], days[-1]), tickformat="%-j"),
     )
     fig.update_yaxes(title_text="Hour")
     fig.update_xaxes(title_text="Day")
@@ -128,12 +109,9 @@ def three_var_graph(
     color_scale = var_color
 
     if data_filter:
-        if min_val <= max_val:
-            df.loc[(df[filter_var] < min_val) | (df[filter_var] > max_val)] = None
-        else:
-            df.loc[(df[filter_var] >= max_val) & (df[filter_var] <= min_val)] = None
+        df = df.loc[range_mask(df[filter_var], min_val, max_val)]
 
-    if df.dropna(subset=["month"]).shape[0] == 0:
+    if df.shape[0] == 0:
         return None
 
     title = (
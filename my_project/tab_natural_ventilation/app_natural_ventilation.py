@@ -15,7 +15,8 @@ from my_project.global_scheme import (
 from dash.dependencies import Input, Output, State
 import numpy as np
 
-from my_project.template_graphs import filter_df_by_month_and_hour
+from my_project.filters import masked, month_hour_mask, range_mask
+from my_project.template_graphs import heatmap_trace
 from my_project.utils import (
     title_with_tooltip,
     generate_chart_name,
@@ -306,10 +307,10 @@ def nv_heatmap(
     filter_var = "DPT"
 
     if dbt_data_filter and (min_dbt_val <= max_dbt_val):
-        df.loc[(df[var] < min_dbt_val) | (df[var] > max_dbt_val), var] = None
+        df = masked(df, range_mask(df[var], min_dbt_val, max_dbt_val), [var])
 
     if dpt_data_filter:
-        df.loc[(df[filter_var] < -200) | (df[filter_var] > max_dpt_val), var] = None
+        df = masked(df, range_mask(df[filter_var], -200, max_dpt_val), [var])
 
         if df.dropna(subset=["month"]).shape[0] == 0:
             return (
@@ -323,9 +324,8 @@ def nv_heatmap(
                 ),
             )
 
-    df = filter_df_by_month_and_hour(
-        df, time_filter, month, hour, invert_month, invert_hour, var
-    )
+    if time_filter:
+        df = masked(df, month_hour_mask(month, hour, invert_month, invert_hour), [var])
 
     var_unit = mapping_dictionary[var][si_ip]["unit"]
 
@@ -361,28 +361,14 @@ def nv_heatmap(
         title += f" and when the {filter_name} is below {max_dpt_val} {filter_unit}."
 
     fig = go.Figure(
-        data=go.Heatmap(
-            y=df["hour"],
-            x=df["UTC_time"].dt.date,
-            z=df[var],
-            colorscale=var_color,
-            zmin=range_z[0],
-            zmax=range_z[1],
+        data=heatmap_trace(
+            df[var],
+            var,
+            var_unit,
+            var_color,
+            range_z,
             connectgaps=False,
             hoverongaps=False,
-            customdata=np.stack((df["month_names"], df["day"]), axis=-1),
-            hovertemplate=(
-                "<b>"
-                + var
-                + ": %{z:.2f} "
-                + var_unit
-                + "</b><br>"
-                + "Month: %{customdata[0]}<br>"
-                + "Day: %{customdata[1]}<br>"
-                + "Hour: %{y}:00<br>"
-            ),
-            colorbar=dict(title=var_unit),
-            name="",
         )
     )
 
@@ -481,29 +467,25 @@ def nv_bar_chart(
 
     color_in = "dodgerblue"
 
-    df["nv_allowed"] = 1
-
-    df = filter_df_by_month_and_hour(
-        df, time_filter, month, hour, invert_month, invert_hour, "nv_allowed"
-    )
-
-    # this should be the total after filtering by time
-    tot_month_hours = df.groupby(df["UTC_time"].dt.month)["nv_allowed"].sum().values
+    selected = np.ones(df.shape[0], dtype=bool)
+    if time_filter:
+        selected = month_hour_mask(month, hour, invert_month, invert_hour)
+    nv_allowed = selected
 
     if dbt_data_filter and (min_dbt_val <= max_dbt_val):
-        df.loc[(df[var] < min_dbt_val) | (df[var] > max_dbt_val), "nv_allowed"] = 0
+        nv_allowed = nv_allowed & range_mask(df[var], min_dbt_val, max_dbt_val)
 
     if dpt_data_filter:
-        df.loc[(df[filter_var] > max_dpt_val), "nv_allowed"] = 0
+        nv_allowed = nv_allowed & ~(df[filter_var].to_numpy() > max_dpt_val)
 
-    n_hours_nv_allowed = (
-        df.dropna(subset="nv_allowed")
-        .groupby(df["UTC_time"].dt.month)["nv_allowed"]
-        .sum()
-        .values
-    )
+    # this should be the total after filtering by time
+    months = df["UTC_time"].dt.month.to_numpy() - 1
+    tot_month_hours = np.bincount(months, selected, minlength=12)
+    n_hours_nv_allowed = np.bincount(months, nv_allowed, minlength=12)
 
-    per_time_nv_allowed = np.round(100 * (n_hours_nv_allowed / tot_month_hours))
+    # the months without selected hours have no percentage
+    with np.errstate(invalid="ignore"):
+        per_time_nv_allowed = np.round(100 * (n_hours_nv_allowed / tot_month_hours))
 
     if len(normalize) == 0:
         fig = go.Figure(
@@ -1,7 +1,6 @@
 import numpy as np
 import plotly.graph_objects as go
 import json
-from pythermalcomfort import psychrometrics as psy
 from math import ceil, floor
 import dash_bootstrap_components as dbc
 from copy import deepcopy
@@ -11,7 +10,8 @@ from my_project.global_scheme import (
     container_row_center_full,
     container_col_center_one_of_three,
 )
-from my_project.template_graphs import filter_df_by_month_and_hour
+from my_project.psychrometrics import psy_ta_rh
+from my_project.filters import month_hour_mask, range_mask
 from my_project.utils import (
     generate_chart_name,
     generate_units,
@@ -27,7 +27,6 @@ from my_project.global_scheme import (
     sun_cloud_tab_explore_dropdown_names,
 )
 from dash.dependencies import Input, Output, State
-import pandas as pd
 
 from app import app
 
@@ -270,19 +269,13 @@ def update_psych_chart(
         month, hour, invert_month, invert_hour
     )
 
-    df = filter_df_by_month_and_hour(
-        df, time_filter, month, hour, invert_month, invert_hour, df.columns
-    )
+    if time_filter:
+        df = df.loc[month_hour_mask(month, hour, invert_month, invert_hour)]
 
     if data_filter:
-        if min_val <= max_val:
-            mask = (df[data_filter_var] < min_val) | (df[data_filter_var] > max_val)
-            df[mask] = None
-        else:
-            mask = (df[data_filter_var] >= max_val) & (df[data_filter_var] <= min_val)
-            df[mask] = None
+        df = df.loc[range_mask(df[data_filter_var], min_val, max_val)]
 
-    if df.dropna(subset=["month"]).shape[0] == 0:
+    if df.shape[0] == 0:
         return (
             dbc.Alert(
                 "No data is available in this location under these conditions. Please "
@@ -325,36 +318,23 @@ def update_psych_chart(
     if colorby_var != "None" and colorby_var != "Frequency":
         title = title + " colored by " + var_name + " (" + var_unit + ")"
 
-    dbt_list = list(range(-60, 60, 1))
+    dbt_list = np.arange(-60, 60, 1)
     rh_list = list(range(10, 110, 10))
 
-    rh_df = pd.DataFrame()
-    for i, rh in enumerate(rh_list):
-        hr_list = np.vectorize(psy.psy_ta_rh)(dbt_list, rh)
-        hr_df = pd.DataFrame.from_records(hr_list)
-        name = "rh" + str(rh)
-        rh_df[name] = hr_df["hr"]
+    dbt_list_convert = dbt_list
+    if si_ip == "ip":
+        dbt_list_convert = dbt_list * 1.8 + 32
 
     fig = go.Figure()
 
     # Add traces
-    for i, rh in enumerate(rh_list):
-        name = "rh" + str(rh)
-
-        dbt_list_convert = list(dbt_list)
-        rh_multiply = list(rh_df[name])
-
-        for k in range(len(rh_df[name])):
-            rh_multiply[k] = rh_multiply[k] * 1000
-
-        if si_ip == "ip":
-            for j in range(len(dbt_list)):
-                dbt_list_convert[j] = dbt_list_convert[j] * 1.8 + 32
+    for rh in rh_list:
+        hr_list = psy_ta_rh(dbt_list, rh)["hr"]
 
         fig.add_trace(
             go.Scatter(
                 x=dbt_list_convert,
-                y=rh_multiply,
+                y=hr_list * 1000,
                 showlegend=False,
                 mode="lines",
                 name="",
@@ -363,9 +343,7 @@ def update_psych_chart(
             )
         )
 
-    df_hr_multiply = list(df["hr"])
-    for k in range(len(df_hr_multiply)):
-        df_hr_multiply[k] = df_hr_multiply[k] * 1000
+    df_hr_multiply = df["hr"] * 1000
     if var == "None":
         fig.add_trace(
             go.Scatter(
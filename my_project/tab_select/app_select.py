@@ -1,6 +1,4 @@
 import base64
-import json
-import re
 
 import dash
 import dash_bootstrap_components as dbc
@@ -8,10 +6,17 @@ from dash.exceptions import PreventUpdate
 from dash_extensions.enrich import Serverside, Output, Input, State, html, dcc
 
 from app import app
-from my_project.extract_df import convert_data
-from my_project.extract_df import create_df, get_data, get_location_info
-from my_project.global_scheme import mapping_dictionary
-from my_project.utils import plot_location_epw_files, generate_chart_name
+from my_project.blob_store import epw_store
+from my_project.dataset_cache import dataset_cache
+from my_project.extract_df import get_data
+from my_project.station_catalog import load_catalog
+from my_project.station_map import (
+    plot_location_epw_files,
+    station_clusters,
+    station_map_figure,
+    view_from_relayout,
+)
+from my_project.utils import generate_chart_name
 
 messages_alert = {
     "start": "To start, upload an EPW file or click on a point on the map!",
@@ -103,7 +108,7 @@ def alert():
 @app.callback(
     [
         Output("meta-store", "data"),
-        Output("lines-store", "data"),
+        Output("epw-hash-store", "data"),
         Output("alert", "is_open"),
         Output("alert", "children"),
         Output("alert", "color"),
@@ -140,12 +145,11 @@ def submitted_data(
                 messages_alert["not_available"],
                 "warning",
             )
-        location_info = get_location_info(
-            lines, url_store
-        )  # we might need to split this call into two, one returns df and one returns location_info
+        digest = epw_store.put(lines)
+        _, location_info = dataset_cache.load(digest, url_store, lines=lines)
         return (
             location_info,
-            lines,
+            digest,
             True,
             messages_alert["success"],
             "success",
@@ -166,10 +170,13 @@ def submitted_data(
                 except UnicodeDecodeError:
                     decoded_string = decoded_bytes.decode("latin-1")
                 lines = decoded_string.split("\n")
-                df, location_info = create_df(lines, list_of_names[0])
+                digest = epw_store.put(lines)
+                _, location_info = dataset_cache.load(
+                    digest, list_of_names[0], lines=lines
+                )
                 return (
                     location_info,
-                    lines,
+                    digest,
                     True,
                     messages_alert["success"],
                     "success",
@@ -201,18 +208,20 @@ def submitted_data(
         Output("si-ip-unit-store", "data"),
     ],
     [
-        Input("lines-store", "modified_timestamp"),
+        Input("epw-hash-store", "modified_timestamp"),
         Input("si-ip-radio-input", "value"),
     ],
-    [State("url-store", "data"), State("lines-store", "data")],
+    [State("url-store", "data"), State("epw-hash-store", "data")],
 )
-def switch_si_ip(ts, si_ip_input, url_store, lines):
-    if lines is not None:
-        df, _ = create_df(lines, url_store)
-        map_json = json.dumps(mapping_dictionary)
-        if si_ip_input == "ip":
-            map_json = convert_data(df, map_json)
-        return Serverside(df), si_ip_input
+def switch_si_ip(ts, si_ip_input, url_store, epw_hash):
+    if epw_hash is not None:
+        df, _ = dataset_cache.load(epw_hash, url_store, si_ip_input)
+        if df is None:
+            return None, None
+        # the key identifies the content, so every session which loads the same
+        # dataset shares the frame kept by the serverside backend
+        key = f"{dataset_cache.key(epw_hash)}-{si_ip_input}"
+        return Serverside(df, key=key), si_ip_input
     else:
         return (
             None,
@@ -269,6 +278,20 @@ def enable_tabs_when_data_is_loaded(meta, data):
         )
 
 
+@app.callback(
+    Output("tab-one-map", "figure"),
+    Input("tab-one-map", "relayoutData"),
+    prevent_initial_call=True,
+)
+def update_map_level_of_detail(relayout_data):
+    """Show the clusters and the stations in the current view of the map"""
+    view = view_from_relayout(relayout_data)
+    if view is None:
+        raise PreventUpdate
+    zoom, center, bounds = view
+    return station_map_figure(station_clusters(), zoom, center, bounds)
+
+
 @app.callback(
     [
         Output("modal", "is_open"),
@@ -285,9 +308,11 @@ def enable_tabs_when_data_is_loaded(meta, data):
 def display_modal_when_data_clicked(clicks_use_epw, click_map, close_clicks, is_open):
     """display the modal to the user and check if he wants to use that file"""
     if click_map:
-        url = re.search(
-            r'href=[\'"]?([^\'" >]+)', click_map["points"][0]["customdata"][-1]
-        ).group(1)
+        station_id = click_map["points"][0]["customdata"][0]
+        if station_id < 0:
+            # clusters of stations can not be selected
+            raise PreventUpdate
+        url = load_catalog().at[station_id, "url"]
         return not is_open, url
     return is_open, ""
 
@@ -301,8 +326,12 @@ def display_modal_when_data_clicked(clicks_use_epw, click_map, close_clicks, is_
     ],
     prevent_initial_call=True,
 )
-def display_modal_when_data_clicked(click_map):
+def update_modal_header(click_map):
     """change the text of the modal header"""
     if click_map:
-        return [f"Analyse data from {click_map['points'][0]['hovertext']}?"]
+        point = click_map["points"][0]
+        if point["customdata"][0] < 0:
+            # clusters of stations do not open the modal
+            raise PreventUpdate
+        return [f"Analyse data from {point['hovertext']}?"]
     return ["Analyse data from this location?"]
@@ -521,8 +521,8 @@ def download_clima_dataframe(n_clicks, meta):
         raise PreventUpdate
     elif meta is not None:
         lines = get_data(meta["url"])
-        lines = [x.strip().replace("\\r", "") for x in lines[:-1]]
-        lines[0] = lines[0].replace("b'", "")
+        if lines is None:
+            raise PreventUpdate
         return dict(
             content="\n".join(lines),
             filename=f"{meta['city']}_{meta['country']}.epw",
@@ -24,6 +24,7 @@ from my_project.tab_sun.charts_sun import (
 from my_project.template_graphs import heatmap, barchart, daily_profile
 from my_project.utils import code_timer
 from my_project.utils import (
+    dataset_stats,
     title_with_tooltip,
     generate_chart_name,
     generate_units,
@@ -202,13 +203,14 @@ def layout_sun(si_ip):
         State("df-store", "data"),
         State("meta-store", "data"),
         State("si-ip-unit-store", "data"),
+        State("epw-hash-store", "data"),
     ],
 )
-def monthly_and_cloud_chart(ts, df, meta, si_ip):
+def monthly_and_cloud_chart(ts, df, meta, si_ip, epw_hash):
     """Update the contents of tab four. Passing in the polar selection and the general info (df, meta)."""
 
     # Sun Radiation
-    monthly = monthly_solar(df, si_ip)
+    monthly = monthly_solar(dataset_stats(epw_hash, si_ip), si_ip)
     monthly = monthly.update_layout(margin=tight_margins)
 
     # Cloud Cover
@@ -274,15 +276,17 @@ def sun_path_chart(ts, view, var, global_local, df, meta, si_ip):
         State("df-store", "data"),
         State("meta-store", "data"),
         State("si-ip-unit-store", "data"),
+        State("epw-hash-store", "data"),
     ],
 )
-def daily(ts, var, global_local, df, meta, si_ip):
+def daily(ts, var, global_local, df, meta, si_ip, epw_hash):
     """Update the contents of tab four section two. Passing in the general info (df, meta)."""
     custom_inputs = generate_custom_inputs(var)
     units = generate_units(si_ip)
+    stats = dataset_stats(epw_hash, si_ip)
     return dcc.Graph(
         config=generate_chart_name("daily", meta, custom_inputs, units),
-        figure=daily_profile(df, var, global_local, si_ip),
+        figure=daily_profile(df, stats, var, global_local, si_ip),
     )
 
 
@@ -16,13 +16,12 @@ from plotly.subplots import make_subplots
 from pvlib import solarposition
 
 
-def monthly_solar(epw_df, si_ip):
-    g_h_rad_month_ave = (
-        epw_df.groupby(["month", "hour"])["glob_hor_rad"].median().reset_index()
-    )
-    dif_h_rad_month_ave = (
-        epw_df.groupby(["month", "hour"])["dif_hor_rad"].median().reset_index()
-    )
+def monthly_solar(stats, si_ip):
+    """Return the monthly median daily profiles of the global and diffuse horizontal
+    radiation, read from the statistics cube of the dataset."""
+    g_h_rad_month_ave = stats.get("glob_hor_rad", "50%", "month_hour")
+    dif_h_rad_month_ave = stats.get("dif_hor_rad", "50%", "month_hour")
+    hours = np.arange(1, 25)
     fig = make_subplots(
         rows=1,
         cols=12,
@@ -35,17 +34,15 @@ def monthly_solar(epw_df, si_ip):
 
         fig.add_trace(
             go.Scatter(
-                x=g_h_rad_month_ave.loc[g_h_rad_month_ave["month"] == i + 1, "hour"],
-                y=g_h_rad_month_ave.loc[
-                    g_h_rad_month_ave["month"] == i + 1, "glob_hor_rad"
-                ],
+                x=hours,
+                y=g_h_rad_month_ave[i],
                 fill="tozeroy",
                 mode="lines",
                 line_color="orange",
                 line_width=2,
                 name="Global",
                 showlegend=is_first,
-                customdata=epw_df.loc[epw_df["month"] == i + 1, "month_names"],
+                customdata=[month_lst[i]] * 24,
                 hovertemplate=(
                     "<b>"
                     + "Global Horizontal Solar Radiation"
@@ -63,19 +60,15 @@ def monthly_solar(epw_df, si_ip):
 
         fig.add_trace(
             go.Scatter(
-                x=dif_h_rad_month_ave.loc[
-                    dif_h_rad_month_ave["month"] == i + 1, "hour"
-                ],
-                y=dif_h_rad_month_ave.loc[
-                    dif_h_rad_month_ave["month"] == i + 1, "dif_hor_rad"
-                ],
+                x=hours,
+                y=dif_h_rad_month_ave[i],
                 fill="tozeroy",
                 mode="lines",
                 line_color="dodgerblue",
                 line_width=2,
                 name="Diffuse",
                 showlegend=is_first,
-                customdata=epw_df.loc[epw_df["month"] == i + 1, "month_names"],
+                customdata=[month_lst[i]] * 24,
                 hovertemplate=(
                     "<b>"
                     + "Diffuse Horizontal Solar Radiation"
@@ -126,11 +119,7 @@ def polar_graph(df, meta, global_local, var, si_ip):
             range_z = [data_min, data_max]
 
     tz = "UTC"
-    times = pd.date_range(
-        "2019-01-01 00:00:00", "2020-01-01", inclusive="left", freq="h", tz=tz
-    )
     delta = timedelta(days=0, hours=time_zone - 1, minutes=0)
-    times = times - delta
     solpos = df.loc[df["apparent_elevation"] > 0, :]
 
     if var == "None":
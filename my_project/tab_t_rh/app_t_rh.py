@@ -5,6 +5,7 @@ from app import app
 from my_project.global_scheme import dropdown_names
 from my_project.template_graphs import heatmap, yearly_profile, daily_profile
 from my_project.utils import (
+    dataset_stats,
     generate_chart_name,
     generate_units,
     generate_units_degree,
@@ -106,14 +107,15 @@ def layout_t_rh():
         Input("dropdown", "value"),
     ],
     [
-        State("df-store", "data"),
         State("meta-store", "data"),
         State("si-ip-unit-store", "data"),
+        State("epw-hash-store", "data"),
     ],
 )
-def update_yearly_chart(ts, global_local, dd_value, df, meta, si_ip):
+def update_yearly_chart(ts, global_local, dd_value, meta, si_ip, epw_hash):
+    stats = dataset_stats(epw_hash, si_ip)
     if dd_value == dropdown_names[var_to_plot[0]]:
-        dbt_yearly = yearly_profile(df, "DBT", global_local, si_ip)
+        dbt_yearly = yearly_profile(stats, "DBT", global_local, si_ip)
         dbt_yearly.update_layout(xaxis=dict(rangeslider=dict(visible=True)))
         units = generate_units_degree(si_ip)
         return dcc.Graph(
@@ -121,7 +123,7 @@ def update_yearly_chart(ts, global_local, dd_value, df, meta, si_ip):
             figure=dbt_yearly,
         )
     else:
-        rh_yearly = yearly_profile(df, "RH", global_local, si_ip)
+        rh_yearly = yearly_profile(stats, "RH", global_local, si_ip)
         rh_yearly.update_layout(xaxis=dict(rangeslider=dict(visible=True)))
         units = generate_units(si_ip)
         return dcc.Graph(
@@ -141,15 +143,18 @@ def update_yearly_chart(ts, global_local, dd_value, df, meta, si_ip):
         State("df-store", "data"),
         State("meta-store", "data"),
         State("si-ip-unit-store", "data"),
+        State("epw-hash-store", "data"),
     ],
 )
-def update_daily(ts, global_local, dd_value, df, meta, si_ip):
+def update_daily(ts, global_local, dd_value, df, meta, si_ip, epw_hash):
+    stats = dataset_stats(epw_hash, si_ip)
     if dd_value == dropdown_names[var_to_plot[0]]:
         units = generate_units_degree(si_ip)
         return dcc.Graph(
             config=generate_chart_name("DryBulbTemperature_daily", meta, units),
             figure=daily_profile(
                 df[["DBT", "hour", "UTC_time", "month_names", "day", "month"]],
+                stats,
                 "DBT",
                 global_local,
                 si_ip,
@@ -161,6 +166,7 @@ def update_daily(ts, global_local, dd_value, df, meta, si_ip):
             config=generate_chart_name("RelativeHumidity_daily", meta, units),
             figure=daily_profile(
                 df[["RH", "hour", "UTC_time", "month_names", "day", "month"]],
+                stats,
                 "RH",
                 global_local,
                 si_ip,
@@ -213,10 +219,10 @@ def update_heatmap(ts, global_local, dd_value, df, meta, si_ip):
         Input("df-store", "modified_timestamp"),
         Input("dropdown", "value"),
     ],
-    [State("df-store", "data"), State("si-ip-unit-store", "data")],
+    [State("si-ip-unit-store", "data"), State("epw-hash-store", "data")],
 )
-def update_table(ts, dd_value, df, si_ip):
+def update_table(ts, dd_value, si_ip, epw_hash):
     """Update the contents of tab three. Passing in general info (df, meta)."""
     return summary_table_tmp_rh_tab(
-        df[["month", "hour", dd_value, "month_names"]], dd_value, si_ip
+        None, dd_value, si_ip, stats=dataset_stats(epw_hash, si_ip)
     )
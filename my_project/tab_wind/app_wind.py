@@ -1,7 +1,12 @@
+import functools
+
 from dash import dcc, html
 from my_project.global_scheme import month_lst, container_row_center_full
 from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
+from my_project.dataset_cache import dataset_cache
 from my_project.template_graphs import heatmap, wind_rose
+from my_project.wind_cube import wind_cube
 from my_project.utils import (
     title_with_tooltip,
     generate_chart_name,
@@ -345,20 +350,36 @@ def layout_wind():
     )
 
 
+# the wind roses only need these columns, they are read from the column store
+wind_rose_columns = ["wind_speed", "wind_dir", "month", "hour"]
+
+
+@functools.lru_cache(maxsize=32)
+def wind_rose_cube(epw_hash, si_ip):
+    """Return the wind cube of the loaded EPW, built once per dataset and units."""
+    df = None
+    if epw_hash is not None:
+        df = dataset_cache.columns(epw_hash, wind_rose_columns, si_ip)
+    if df is None:
+        raise PreventUpdate
+    return wind_cube(df, si_ip)
+
+
 # wind rose
 @app.callback(
     Output("wind-rose", "children"),
     Input("df-store", "modified_timestamp"),
     [
-        State("df-store", "data"),
+        State("epw-hash-store", "data"),
         State("meta-store", "data"),
         State("si-ip-unit-store", "data"),
     ],
 )
-def update_annual_wind_rose(ts, df, meta, si_ip):
+def update_annual_wind_rose(ts, epw_hash, meta, si_ip):
     """Update the contents of tab five. Passing in the info from the sliders and the general info (df, meta)."""
 
-    annual = wind_rose(df, "", [1, 12], [1, 24], True, si_ip)
+    cube = wind_rose_cube(epw_hash, si_ip)
+    annual = wind_rose(cube, "", [1, 12], [1, 24], True, si_ip)
     units = generate_units(si_ip)
     return dcc.Graph(
         config=generate_chart_name("annual_wind_rose", meta, units),
@@ -427,13 +448,13 @@ def update_tab_wind_direction(global_local, df, meta, si_ip):
         Input("tab5-custom-end-hour", "value"),
     ],
     [
-        State("df-store", "data"),
+        State("epw-hash-store", "data"),
         State("meta-store", "data"),
         State("si-ip-unit-store", "data"),
     ],
 )
 def update_custom_wind_rose(
-    ts, start_month, start_hour, end_month, end_hour, df, meta, si_ip
+    ts, start_month, start_hour, end_month, end_hour, epw_hash, meta, si_ip
 ):
     """Update the contents of tab five. Passing in the info from the sliders and the general info (df, meta)."""
 
@@ -441,18 +462,9 @@ def update_custom_wind_rose(
     end_hour = int(end_hour)
     start_month = int(start_month)
     end_month = int(end_month)
-
-    # Wind Rose Graphs
-    if start_month <= end_month:
-        df = df.loc[(df["month"] >= start_month) & (df["month"] <= end_month)]
-    else:
-        df = df.loc[(df["month"] <= end_month) | (df["month"] >= start_month)]
-    if start_hour <= end_hour:
-        df = df.loc[(df["hour"] >= start_hour) & (df["hour"] <= end_hour)]
-    else:
-        df = df.loc[(df["hour"] <= end_hour) | (df["hour"] >= start_hour)]
+    cube = wind_rose_cube(epw_hash, si_ip)
     custom = wind_rose(
-        df, "", [start_month, end_month], [start_hour, end_hour], True, si_ip
+        cube, "", [start_month, end_month], [start_hour, end_hour], True, si_ip
     )
     custom_inputs = generate_custom_inputs_time(
         start_month, end_month, start_hour, end_hour
@@ -480,12 +492,13 @@ def update_custom_wind_rose(
         Input("df-store", "modified_timestamp"),
     ],
     [
-        State("df-store", "data"),
+        State("epw-hash-store", "data"),
         State("meta-store", "data"),
         State("si-ip-unit-store", "data"),
     ],
 )
-def update_seasonal_graphs(ts, df, meta, si_ip):
+def update_seasonal_graphs(ts, epw_hash, meta, si_ip):
+    cube = wind_rose_cube(epw_hash, si_ip)
     hours = [1, 24]
     winter_months = [12, 2]
     spring_months = [3, 5]
@@ -493,34 +506,16 @@ def update_seasonal_graphs(ts, df, meta, si_ip):
     fall_months = [9, 12]
 
     # Wind Rose Graphs
-    winter = wind_rose(df, "", winter_months, hours, False, si_ip)
-    spring = wind_rose(df, "", spring_months, hours, True, si_ip)
-    summer = wind_rose(df, "", summer_months, hours, False, si_ip)
-    fall = wind_rose(df, "", fall_months, hours, False, si_ip)
+    winter = wind_rose(cube, "", winter_months, hours, False, si_ip)
+    spring = wind_rose(cube, "", spring_months, hours, True, si_ip)
+    summer = wind_rose(cube, "", summer_months, hours, False, si_ip)
+    fall = wind_rose(cube, "", fall_months, hours, False, si_ip)
 
     # Text
-    winter_df = df.loc[
-        (df["month"] <= winter_months[1]) | (df["month"] >= winter_months[0])
-    ]
-    query_calm_wind = "wind_speed == 0"
-    winter_total_count = winter_df.shape[0]
-    winter_calm_count = winter_df.query(query_calm_wind).shape[0]
-
-    spring_df = df.loc[
-        (df["month"] >= spring_months[0]) & (df["month"] <= spring_months[1])
-    ]
-    spring_total_count = spring_df.shape[0]
-    spring_calm_count = spring_df.query(query_calm_wind).shape[0]
-
-    summer_df = df.loc[
-        (df["month"] >= summer_months[0]) & (df["month"] <= summer_months[1])
-    ]
-    summer_total_count = summer_df.shape[0]
-    summer_calm_count = summer_df.query(query_calm_wind).shape[0]
-
-    fall_df = df.loc[(df["month"] >= fall_months[0]) & (df["month"] <= fall_months[1])]
-    fall_total_count = fall_df.shape[0]
-    fall_calm_count = fall_df.query(query_calm_wind).shape[0]
+    _, winter_calm_count, winter_total_count = cube.window(winter_months, hours)
+    _, spring_calm_count, spring_total_count = cube.window(spring_months, hours)
+    _, summer_calm_count, summer_total_count = cube.window(summer_months, hours)
+    _, fall_calm_count, fall_total_count = cube.window(fall_months, hours)
 
     def seasonal_chart_caption(month_start, month_end, count, n_calm):
         return (
@@ -594,13 +589,14 @@ def update_seasonal_graphs(ts, df, meta, si_ip):
     # General
     Input("df-store", "modified_timestamp"),
     [
-        State("df-store", "data"),
+        State("epw-hash-store", "data"),
         State("meta-store", "data"),
         State("si-ip-unit-store", "data"),
     ],
 )
-def update_daily_graphs(ts, df, meta, si_ip):
+def update_daily_graphs(ts, epw_hash, meta, si_ip):
     """Update the contents of tab five. Passing in the info from the sliders and the general info (df, meta)."""
+    cube = wind_rose_cube(epw_hash, si_ip)
 
     months = [1, 12]
     morning_times = [6, 13]
@@ -608,27 +604,14 @@ def update_daily_graphs(ts, df, meta, si_ip):
     night_times = [22, 5]
 
     # Wind Rose Graphs
-    morning = wind_rose(df, "", months, morning_times, False, si_ip)
-    noon = wind_rose(df, "", months, noon_times, False, si_ip)
-    night = wind_rose(df, "", months, night_times, True, si_ip)
+    morning = wind_rose(cube, "", months, morning_times, False, si_ip)
+    noon = wind_rose(cube, "", months, noon_times, False, si_ip)
+    night = wind_rose(cube, "", months, night_times, True, si_ip)
 
     # Text
-    query_calm_wind = "wind_speed == 0"
-    morning_df = df.loc[
-        (df["hour"] >= morning_times[0]) & (df["hour"] <= morning_times[1])
-    ]
-    morning_total_count = morning_df.shape[0]
-    morning_calm_count = morning_df.query(query_calm_wind).shape[0]
-
-    noon_df = df.loc[
-        (df["hour"] >= morning_times[0]) & (df["hour"] <= morning_times[1])
-    ]
-    noon_total_count = noon_df.shape[0]
-    noon_calm_count = noon_df.query(query_calm_wind).shape[0]
-
-    night_df = df.loc[(df["hour"] <= night_times[1]) | (df["hour"] >= night_times[0])]
-    night_total_count = night_df.shape[0]
-    night_calm_count = night_df.query(query_calm_wind).shape[0]
+    _, morning_calm_count, morning_total_count = cube.window(months, morning_times)
+    _, noon_calm_count, noon_total_count = cube.window(months, noon_times)
+    _, night_calm_count, night_total_count = cube.window(months, night_times)
 
     def daily_chart_caption(hour_start, hour_end, count, calm_count):
         return (
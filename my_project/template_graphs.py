@@ -1,3 +1,5 @@
+import functools
+
 import dash_bootstrap_components as dbc
 import numpy as np
 import pandas as pd
@@ -7,6 +9,9 @@ from plotly.subplots import make_subplots
 
 from my_project.global_scheme import mapping_dictionary
 from .global_scheme import month_lst, template, tight_margins
+from .filters import masked, month_hour_mask
+from .year_calendar import calendar_table
+from .wind_cube import sector_directions
 from .utils import determine_month_and_hour_filter
 
 
@@ -29,7 +34,7 @@ def violin(df, var, global_local, si_ip):
     fig = go.Figure()
     fig.add_trace(
         go.Violin(
-            x=df["fake_year"],
+            x0="year",
             y=data_day,
             line_color="#ffaa00",
             name="Day",
@@ -41,7 +46,7 @@ def violin(df, var, global_local, si_ip):
 
     fig.add_trace(
         go.Violin(
-            x=df["fake_year"],
+            x0="year",
             y=data_night,
             line_color="#00264d",
             name="Night",
@@ -79,8 +84,9 @@ def violin(df, var, global_local, si_ip):
     return fig
 
 
-def yearly_profile(df, var, global_local, si_ip):
-    """Return yearly profile figure based on the 'var' col."""
+def yearly_profile(stats, var, global_local, si_ip):
+    """Return yearly profile figure based on the 'var' col, the daily values are read
+    from the statistics cube of the dataset."""
     var_unit = mapping_dictionary[var][si_ip]["unit"]
     var_range = mapping_dictionary[var][si_ip]["range"]
     var_name = mapping_dictionary[var]["name"]
@@ -91,26 +97,28 @@ def yearly_profile(df, var, global_local, si_ip):
         range_y = var_range
     else:
         # Set maximum and minimum according to data
-        data_max = 5 * ceil(df[var].max() / 5)
-        data_min = 5 * floor(df[var].min() / 5)
+        data_max = 5 * ceil(stats.get(var, "max", "year") / 5)
+        data_min = 5 * floor(stats.get(var, "min", "year") / 5)
         range_y = [data_min, data_max]
 
     var_single_color = var_color[len(var_color) // 2]
     custom_ylim = range_y
     # Get min, max, and mean of each day
-    dbt_day = df.groupby(np.arange(len(df.index)) // 24)[var].agg(
-        ["min", "max", "mean"]
-    )
+    dbt_day = {stat: stats.get(var, stat, "doy") for stat in ["min", "max", "mean"]}
+    calendar = calendar_table()
+    days = calendar["UTC_time"][::24].date
+    month_names = calendar["month_names"][::24]
+    month_days = calendar["day"][::24]
 
     trace1 = go.Bar(
-        x=df["UTC_time"].dt.date.unique(),
+        x=days,
         y=dbt_day["max"] - dbt_day["min"],
         base=dbt_day["min"],
         marker_color=var_single_color,
         marker_opacity=0.3,
         name=var_name + " Range",
         customdata=np.stack(
-            (dbt_day["mean"], df.iloc[::24, :]["month_names"], df.iloc[::24, :]["day"]),
+            (dbt_day["mean"], month_names, month_days),
             axis=-1,
         ),
         hovertemplate=(
@@ -125,14 +133,14 @@ def yearly_profile(df, var, global_local, si_ip):
     )
 
     trace2 = go.Scatter(
-        x=df["UTC_time"].dt.date.unique(),
+        x=days,
         y=dbt_day["mean"],
         name="Average " + var_name,
         mode="lines",
         marker_color=var_single_color,
         marker_opacity=1,
         customdata=np.stack(
-            (dbt_day["mean"], df.iloc[::24, :]["month_names"], df.iloc[::24, :]["day"]),
+            (dbt_day["mean"], month_names, month_days),
             axis=-1,
         ),
         hovertemplate=(
@@ -144,14 +152,14 @@ def yearly_profile(df, var, global_local, si_ip):
 
     if var == "DBT":
         # plot ashrae adaptive comfort limits (80%)
-        lo80 = df.groupby("DOY")["adaptive_cmf_80_low"].mean().values
-        hi80 = df.groupby("DOY")["adaptive_cmf_80_up"].mean().values
-        rmt = df.groupby("DOY")["adaptive_cmf_rmt"].mean().values
+        lo80 = stats.get("adaptive_cmf_80_low", "mean", "doy")
+        hi80 = stats.get("adaptive_cmf_80_up", "mean", "doy")
+        rmt = stats.get("adaptive_cmf_rmt", "mean", "doy")
         # set color https://github.com/CenterForTheBuiltEnvironment/clima/issues/113 implementation
         var_bar_colors = np.where((rmt > 40) | (rmt < 10), "lightgray", "darkgray")
 
         trace3 = go.Bar(
-            x=df["UTC_time"].dt.date.unique(),
+            x=days,
             y=hi80 - lo80,
             base=lo80,
             name="ASHRAE adaptive comfort (80%)",
@@ -163,11 +171,11 @@ def yearly_profile(df, var, global_local, si_ip):
         )
 
         # plot ashrae adaptive comfort limits (90%)
-        lo90 = df.groupby("DOY")["adaptive_cmf_90_low"].mean().values
-        hi90 = df.groupby("DOY")["adaptive_cmf_90_up"].mean().values
+        lo90 = stats.get("adaptive_cmf_90_low", "mean", "doy")
+        hi90 = stats.get("adaptive_cmf_90_up", "mean", "doy")
 
         trace4 = go.Bar(
-            x=df["UTC_time"].dt.date.unique(),
+            x=days,
             y=hi90 - lo90,
             base=lo90,
             name="ASHRAE adaptive comfort (90%)",
@@ -187,7 +195,7 @@ def yearly_profile(df, var, global_local, si_ip):
         hi_rh_df = pd.DataFrame({"hiRH": hi_rh})
 
         trace3 = go.Bar(
-            x=df["UTC_time"].dt.date.unique(),
+            x=days,
             y=hi_rh_df["hiRH"] - lo_rh_df["loRH"],
             base=lo_rh_df["loRH"],
             name="humidity comfort band",
@@ -231,8 +239,9 @@ def yearly_profile(df, var, global_local, si_ip):
     return fig
 
 
-def daily_profile(df, var, global_local, si_ip):
-    """Return the daily profile based on the 'var' col."""
+def daily_profile(df, stats, var, global_local, si_ip):
+    """Return the daily profile based on the 'var' col, the median lines are read
+    from the statistics cube of the dataset."""
     var_name = mapping_dictionary[var]["name"]
     var_unit = mapping_dictionary[var][si_ip]["unit"]
     var_range = mapping_dictionary[var][si_ip]["range"]
@@ -242,12 +251,12 @@ def daily_profile(df, var, global_local, si_ip):
         range_y = var_range
     else:
         # Set maximum and minimum according to data
-        data_max = 5 * ceil(df[var].max() / 5)
-        data_min = 5 * floor(df[var].min() / 5)
+        data_max = 5 * ceil(stats.get(var, "max", "year") / 5)
+        data_min = 5 * floor(stats.get(var, "min", "year") / 5)
         range_y = [data_min, data_max]
 
     var_single_color = var_color[len(var_color) // 2]
-    var_month_ave = df.groupby(["month", "hour"])[var].median().reset_index()
+    var_month_ave = stats.get(var, "50%", "month_hour")
     fig = make_subplots(
         rows=1,
         cols=12,
@@ -280,8 +289,8 @@ def daily_profile(df, var, global_local, si_ip):
 
         fig.add_trace(
             go.Scatter(
-                x=var_month_ave.loc[var_month_ave["month"] == i + 1, "hour"],
-                y=var_month_ave.loc[var_month_ave["month"] == i + 1, var],
+                x=np.arange(1, 25),
+                y=var_month_ave[i],
                 mode="lines",
                 line_color=var_single_color,
                 line_width=3,
@@ -311,6 +320,43 @@ def daily_profile(df, var, global_local, si_ip):
     return fig
 
 
+@functools.lru_cache(maxsize=None)
+def heatmap_axes():
+    """Return the dates of the days and the hours of the year, the axes of the
+    heatmaps."""
+    days = calendar_table()["UTC_time"][::24].strftime("%Y-%m-%d")
+    return tuple(days), tuple(range(1, 25))
+
+
+def heatmap_trace(values, var, var_unit, var_color, range_z, **kwargs):
+    """Return the heatmap trace of the 8760 hourly values of a variable.
+
+    The values are sent as a 24 x 365 matrix with one column per day and the hover
+    labels are derived from the axes, instead of sending a date, an hour and the
+    hover data for each hour of the year.
+    """
+    days, hours = heatmap_axes()
+    z = np.asarray(values, dtype=float).reshape(len(days), len(hours)).T
+    return go.Heatmap(
+        x=days,
+        y=hours,
+        z=z,
+        colorscale=var_color,
+        zmin=range_z[0],
+        zmax=range_z[1],
+        hovertemplate=(
+            "<b>"
+            + var
+            + ": %{z:.2f} "
+            + var_unit
+            + "</b><br>Month: %{x|%b}<br>Day: %{x|%-d}<br>Hour: %{y}:00<br>"
+        ),
+        name="",
+        colorbar=dict(title=var_unit),
+        **kwargs,
+    )
+
+
 def heatmap_with_filter(
     df,
     var,
@@ -328,9 +374,9 @@ def heatmap_with_filter(
     var_range = mapping_dictionary[var][si_ip]["range"]
     var_color = mapping_dictionary[var]["color"]
 
-    df = filter_df_by_month_and_hour(
-        df, time_filter, month, hour, invert_month, invert_hour, var
-    )
+    if time_filter:
+        mask = month_hour_mask(month, hour, invert_month, invert_hour)
+        df = masked(df, mask, [var])
 
     start_month, end_month, start_hour, end_hour = determine_month_and_hour_filter(
         month, hour, invert_month, invert_hour
@@ -355,27 +401,7 @@ def heatmap_with_filter(
         data_max = 5 * ceil(df[var].max() / 5)
         data_min = 5 * floor(df[var].min() / 5)
         range_z = [data_min, data_max]
-    fig = go.Figure(
-        data=go.Heatmap(
-            y=df["hour"],
-            x=df["UTC_time"].dt.date,
-            z=df[var],
-            colorscale=var_color,
-            zmin=range_z[0],
-            zmax=range_z[1],
-            customdata=np.stack((df["month_names"], df["day"]), axis=-1),
-            hovertemplate=(
-                "<b>"
-                + var
-                + ": %{z:.2f} "
-                + var_unit
-                + "</b><br>Month: %{customdata[0]}<br>Day: %{customdata[1]}<br>Hour:"
-                " %{y}:00<br>"
-            ),
-            name="",
-            colorbar=dict(title=var_unit),
-        )
-    )
+    fig = go.Figure(data=heatmap_trace(df[var], var, var_unit, var_color, range_z))
 
     fig.update_xaxes(dtick="M1", tickformat="%b", ticklabelmode="period")
 
@@ -414,27 +440,7 @@ def heatmap(df, var, global_local, si_ip):
         data_max = 5 * ceil(df[var].max() / 5)
         data_min = 5 * floor(df[var].min() / 5)
         range_z = [data_min, data_max]
-    fig = go.Figure(
-        data=go.Heatmap(
-            y=df["hour"],
-            x=df["UTC_time"].dt.date,
-            z=df[var],
-            colorscale=var_color,
-            zmin=range_z[0],
-            zmax=range_z[1],
-            customdata=np.stack((df["month_names"], df["day"]), axis=-1),
-            hovertemplate=(
-                "<b>"
-                + var
-                + ": %{z:.2f} "
-                + var_unit
-                + "</b><br>Month: %{customdata[0]}<br>Day: %{customdata[1]}<br>Hour:"
-                " %{y}:00<br>"
-            ),
-            name="",
-            colorbar=dict(title=var_unit),
-        )
-    )
+    fig = go.Figure(data=heatmap_trace(df[var], var, var_unit, var_color, range_z))
 
     fig.update_xaxes(dtick="M1", tickformat="%b", ticklabelmode="period")
 
@@ -462,61 +468,21 @@ def speed_labels(bins, units):
     return labels
 
 
-def wind_rose(df, title, month, hour, labels, si_ip):
-    """Return the wind rose figure.
+def wind_rose(cube, title, month, hour, labels, si_ip):
+    """Return the wind rose figure of the month and hour ranges of a wind cube.
 
     Based on:  https://gist.github.com/phobson/41b41bdd157a2bcf6e14
     """
-    start_month = month[0]
-    end_month = month[1]
-    start_hour = hour[0]
-    end_hour = hour[1]
-    if start_month <= end_month:
-        df = df.loc[(df["month"] >= start_month) & (df["month"] <= end_month)]
-    else:
-        df = df.loc[(df["month"] <= end_month) | (df["month"] >= start_month)]
-    if start_hour <= end_hour:
-        df = df.loc[(df["hour"] >= start_hour) & (df["hour"] <= end_hour)]
-    else:
-        df = df.loc[(df["hour"] <= end_hour) | (df["hour"] >= start_hour)]
-
     spd_colors = mapping_dictionary["wind_speed"]["color"]
     spd_unit = mapping_dictionary["wind_speed"][si_ip]["unit"]
-    spd_bins = [-1, 0.5, 1.5, 3.3, 5.5, 7.9, 10.7, 13.8, 17.1, 20.7, np.inf]
-    if si_ip == "ip":
-        spd_bins = convert_bins(spd_bins)
-
-    spd_labels = speed_labels(spd_bins, spd_unit)
-    dir_bins = np.arange(-22.5 / 2, 360 + 22.5, 22.5)
-    dir_labels = (dir_bins[:-1] + dir_bins[1:]) / 2
-    total_count = df.shape[0]
-    calm_count = df.query("wind_speed == 0").shape[0]
-    rose = (
-        df.assign(
-            WindSpd_bins=lambda df: pd.cut(
-                df["wind_speed"], bins=spd_bins, labels=spd_labels, right=True
-            )
-        )
-        .assign(
-            WindDir_bins=lambda df: pd.cut(
-                df["wind_dir"], bins=dir_bins, labels=dir_labels, right=False
-            )
-        )
-        .replace({"WindDir_bins": {360: 0}})
-        .groupby(by=["WindSpd_bins", "WindDir_bins"])
-        .size()
-        .unstack(level="WindSpd_bins")
-        .fillna(0)
-        .assign(calm=lambda df: calm_count / df.shape[0])
-        .sort_index(axis=1)
-        .applymap(lambda x: x / total_count * 100)
-    )
+    spd_labels = speed_labels(cube.speed_bins, spd_unit)
+    rose = cube.rose(month, hour)
     fig = go.Figure()
-    for i, col in enumerate(rose.columns):
+    for i, col in enumerate(spd_labels):
         fig.add_trace(
             go.Barpolar(
-                r=rose[col],
-                theta=rose.index.categories,
+                r=rose[:, i],
+                theta=sector_directions,
                 name=col,
                 marker_color=spd_colors[i],
                 hovertemplate="frequency: %{r:.2f}%"
@@ -563,15 +529,6 @@ def wind_rose(df, title, month, hour, labels, si_ip):
     return fig
 
 
-def convert_bins(sbins):
-    i = 0
-    for x in sbins:
-        x = x * 196.85039370078738
-        sbins[i] = round(x, 1)
-        i = i + 1
-    return sbins
-
-
 def thermal_stress_stacked_barchart(
     df, var, time_filter, month, hour, invert_month, invert_hour, normalize, title
 ):
@@ -600,9 +557,9 @@ def thermal_stress_stacked_barchart(
         "#A3302B",
         "#6B1F18",
     ]
-    df = filter_df_by_month_and_hour(
-        df, time_filter, month, hour, invert_month, invert_hour, var
-    )
+    if time_filter:
+        mask = month_hour_mask(month, hour, invert_month, invert_hour)
+        df = masked(df, mask, [var])
     start_month, end_month, start_hour, end_hour = determine_month_and_hour_filter(
         month, hour, invert_month, invert_hour
     )
@@ -810,31 +767,6 @@ def barchart(df, var, time_filter_info, data_filter_info, normalize, si_ip):
     return fig
 
 
-def filter_df_by_month_and_hour(
-    df, time_filter, month, hour, invert_month, invert_hour, var
-):
-    start_month, end_month, start_hour, end_hour = determine_month_and_hour_filter(
-        month, hour, invert_month, invert_hour
-    )
-
-    if time_filter:
-        if start_month <= end_month:
-            mask = (df["month"] < start_month) | (df["month"] > end_month)
-            df.loc[mask, var] = None
-        else:
-            mask = (df["month"] >= end_month) & (df["month"] <= start_month)
-            df.loc[mask, var] = None
-
-        if start_hour <= end_hour:
-            mask = (df["hour"] < start_hour) | (df["hour"] > end_hour)
-            df.loc[mask, var] = None
-        else:
-            mask = (df["hour"] >= end_hour) & (df["hour"] <= start_hour)
-            df.loc[mask, var] = None
-
-    return df
-
-
 def catch(func, handle=lambda e: e, *args, **kwargs):
     # Handle category not in dictionary
     try:
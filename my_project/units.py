@@ -0,0 +1,57 @@
+import pandas as pd
+
+from my_project.global_scheme import mapping_dictionary
+
+# scale and offset of the affine transformation from SI to IP units for each
+# conversion function listed in the mapping dictionary
+ip_conversions = {
+    "temperature": (1.8, 32),
+    "pressure": (0.000145038, 0),
+    "irradiation": (0.3169983306, 0),
+    "illuminance": (0.0929, 0),
+    "zenith_illuminance": (0.0929, 0),
+    "speed": (196.85039370078738, 0),
+    "visibility": (0.6215, 0),
+    "enthalpy": (0.0004, 0),
+}
+
+# columns that need to be converted to IP units grouped by conversion function
+ip_column_groups = {name: [] for name in ip_conversions}
+for col, info in mapping_dictionary.items():
+    if info.get("conversion_function"):
+        ip_column_groups[info["conversion_function"]].append(col)
+ip_column_groups["temperature"] += [
+    "adaptive_comfort",
+    "adaptive_cmf_80_low",
+    "adaptive_cmf_80_up",
+    "adaptive_cmf_90_low",
+    "adaptive_cmf_90_up",
+]
+
+
+def to_units(df, si_ip, columns=None):
+    """Return the columns of an SI dataframe in the 'si' or 'ip' unit system.
+
+    The dataframe is never modified, the columns which do not need to be converted
+    are shared with it and each group of columns with the same conversion function
+    is converted with a single vectorized operation. If columns is None all the
+    columns are returned.
+    """
+    if columns is None:
+        columns = list(df.columns)
+    if si_ip != "ip":
+        return df[columns]
+
+    data = {col: df[col] for col in columns}
+    for name, group in ip_column_groups.items():
+        group = [col for col in group if col in data]
+        if not group:
+            continue
+        scale, offset = ip_conversions[name]
+        values = df[group].to_numpy(dtype=float) * scale
+        if offset:
+            values += offset
+        for ix, col in enumerate(group):
+            data[col] = pd.Series(values[:, ix], index=df.index, name=col)
+
+    return pd.DataFrame(data, copy=False)
@@ -1,16 +1,14 @@
 import copy
 import functools
-import json
 import time
 
 import dash_bootstrap_components as dbc
 import pandas as pd
-import plotly.express as px
-import requests
 from dash import html, dash_table, dcc
-from pandas import json_normalize
+from dash.exceptions import PreventUpdate
 
-from my_project.global_scheme import fig_config, mapping_dictionary
+from my_project.dataset_cache import dataset_cache
+from my_project.global_scheme import fig_config, mapping_dictionary, month_lst
 
 
 def code_timer(func):
@@ -28,6 +26,16 @@ def code_timer(func):
     return wrapper_timer
 
 
+def dataset_stats(epw_hash, si_ip):
+    """Return the statistics cube of the loaded EPW."""
+    stats = None
+    if epw_hash is not None:
+        stats = dataset_cache.stats(epw_hash, si_ip)
+    if stats is None:
+        raise PreventUpdate
+    return stats
+
+
 def generate_chart_name(tab_name, meta=None, custom_inputs=None, units=None):
     figure_config = copy.deepcopy(fig_config)
     custom_str = ""
@@ -195,59 +203,6 @@ def generate_custom_inputs_psy(
     return custom_inputs
 
 
-def plot_location_epw_files():
-    with open("./assets/data/epw_location.json", encoding="utf8") as data_file:
-        data = json.load(data_file)
-
-    df = json_normalize(data["features"])
-    df[["lon", "lat"]] = pd.DataFrame(df["geometry.coordinates"].tolist())
-    df["lat"] += 0.005
-    df["lat"] += 0.005
-    df = df.rename(columns={"properties.epw": "Source"})
-
-    fig = px.scatter_mapbox(
-        df.head(2585),
-        lat="lat",
-        lon="lon",
-        hover_name="properties.title",
-        color_discrete_sequence=["#3a0ca3"],
-        hover_data=["Source"],
-        zoom=2,
-        height=500,
-    )
-    try:
-        print(requests.get("https://climate.onebuilding.org", timeout=6))
-
-        df_one_building = pd.read_csv(
-            "./assets/data/one_building.csv", compression="gzip"
-        )
-
-        fig2 = px.scatter_mapbox(
-            df_one_building,
-            lat="lat",
-            lon="lon",
-            hover_name=df_one_building["name"],
-            color_discrete_sequence=["#4895ef"],
-            hover_data=[
-                "period",
-                "elevation (m)",
-                "time zone (GMT)",
-                "99% Heating DB",
-                "1% Cooling DB ",
-                "Source",
-            ],
-            zoom=2,
-            height=500,
-        )
-        fig.add_trace(fig2.data[0])
-    except requests.exceptions.ConnectTimeout:
-        pass
-    fig.update_layout(mapbox_style="carto-positron")
-    fig.update_layout(margin={"r": 0, "t": 0, "l": 0, "b": 0})
-
-    return fig
-
-
 def title_with_tooltip(text, tooltip_text, id_button):
     display_tooltip = "none"
     if tooltip_text:
@@ -322,25 +277,36 @@ def title_with_link(
     )
 
 
-def summary_table_tmp_rh_tab(df, value, si_ip):
-    df_summary = (
-        df.groupby(["month_names", "month"])[value]
-        .describe(percentiles=[0.01, 0.25, 0.5, 0.75, 0.99])
-        .round(2)
-    )
-    df_summary = df_summary.reset_index(level="month_names").sort_index()
-    df_summary = df_summary.drop(["count"], axis=1)
-    df_summary = df_summary.rename(columns={"month_names": "month"})
-
-    df_sum = (
-        df[value]
-        .describe(percentiles=[0.01, 0.25, 0.5, 0.75, 0.99])
-        .round(2)
-        .to_frame()
-    )
-    df_sum = df_sum.T.assign(count="Year").rename(columns={"count": "month"})
+def summary_table_tmp_rh_tab(df, value, si_ip, stats=None):
+    """Return the table with the monthly and yearly statistics of value. They are
+    read from the statistics cube of the dataset if it is given, otherwise they
+    are computed from df, e.g. for filtered datasets."""
+    if stats is not None:
+        df_summary = stats.describe(value, "month").round(2)
+        df_summary = df_summary.drop(["count"], axis=1)
+        df_summary.insert(0, "month", month_lst)
+        df_sum = stats.describe(value, "year").round(2)
+        df_sum = df_sum.assign(count="Year").rename(columns={"count": "month"})
+        df_summary = pd.concat([df_summary, df_sum])
+    else:
+        df_summary = (
+            df.groupby(["month_names", "month"])[value]
+            .describe(percentiles=[0.01, 0.25, 0.5, 0.75, 0.99])
+            .round(2)
+        )
+        df_summary = df_summary.reset_index(level="month_names").sort_index()
+        df_summary = df_summary.drop(["count"], axis=1)
+        df_summary = df_summary.rename(columns={"month_names": "month"})
+
+        df_sum = (
+            df[value]
+            .describe(percentiles=[0.01, 0.25, 0.5, 0.75, 0.99])
+            .round(2)
+            .to_frame()
+        )
+        df_sum = df_sum.T.assign(count="Year").rename(columns={"count": "month"})
 
-    df_summary = pd.concat([df_summary, df_sum])
+        df_summary = pd.concat([df_summary, df_sum])
 
     unit = (
         mapping_dictionary[value][si_ip]["unit"]
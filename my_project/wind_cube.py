@@ -0,0 +1,104 @@
+import numpy as np
+
+from my_project.dataset_metrics import in_range
+
+# wind speed bins of the wind rose in m/s, the first one contains calm hours
+wind_speed_bins = [-1, 0.5, 1.5, 3.3, 5.5, 7.9, 10.7, 13.8, 17.1, 20.7, np.inf]
+# edges of the 16 wind direction sectors of 22.5 degrees, the first sector is
+# centred on north and the last edge closes the sector north of 348.75 degrees
+sector_edges = np.arange(-22.5 / 2, 360 + 22.5, 22.5)
+sector_directions = np.arange(0, 360, 22.5)
+
+
+def speed_bins(si_ip):
+    """Return the wind speed bins of the wind roses in the 'si' or 'ip' unit system,
+    the first bin contains the calm hours."""
+    bins = np.array(wind_speed_bins, dtype=float)
+    if si_ip == "ip":
+        bins = np.round(bins * 196.85039370078738, 1)
+    return bins
+
+
+def wind_cube(df, si_ip):
+    """Return the wind cube of a dataset with the month, hour, wind_speed and
+    wind_dir columns, the wind speed must be in the units of si_ip.
+
+    Speeds are binned as pd.cut(right=True) and directions as pd.cut(right=False)
+    would, hours with a missing or out of range speed or direction are not counted
+    in the roses but are counted in the number of hours.
+    """
+    bins = speed_bins(si_ip)
+    n_speed, n_sector = len(bins) - 1, len(sector_edges) - 1
+    month = df["month"].to_numpy() - 1
+    hour = df["hour"].to_numpy() - 1
+    wind_speed = df["wind_speed"].to_numpy(dtype=float)
+    speed = np.digitize(wind_speed, bins, right=True) - 1
+    sector = np.digitize(df["wind_dir"].to_numpy(dtype=float), sector_edges) - 1
+    # missing values, like the direction 999 of EPW files, are outside of the bins
+    valid = (speed >= 0) & (speed < n_speed) & (sector >= 0) & (sector < n_sector)
+
+    time = month * 24 + hour
+    cell = (time[valid] * n_speed + speed[valid]) * n_sector + sector[valid]
+    counts = np.bincount(cell, minlength=12 * 24 * n_speed * n_sector)
+    counts = counts.reshape(12, 24, n_speed, n_sector)
+    # the sector just west of north is the north sector
+    counts[..., 0] += counts[..., -1]
+    hours = np.bincount(time, minlength=12 * 24).reshape(12, 24)
+    calm = np.bincount(time[wind_speed == 0], minlength=12 * 24).reshape(12, 24)
+    return WindCube(counts[..., :-1], calm, hours, bins)
+
+
+class WindCube:
+    """Number of hours of a dataset per month, hour, wind speed bin and direction
+    sector, built once per dataset so that every wind rose is a sum over its months
+    and hours.
+
+    counts has shape (12, 24, speed bins, 16), calm and hours have shape (12, 24)
+    and hold the number of hours without wind and the number of hours.
+    """
+
+    def __init__(self, counts, calm, hours, speed_bins):
+        self.counts = counts
+        self.calm = calm
+        self.hours = hours
+        self.speed_bins = speed_bins
+
+    def window(self, month, hour):
+        """Return the counts per speed bin and direction sector, the number of calm
+        hours and the number of hours in the inclusive month and hour ranges, which
+        wrap around when the start is greater than the end."""
+        months = in_range(np.arange(1, 13), *month)
+        hours = in_range(np.arange(1, 25), *hour)
+        selected = np.ix_(months, hours)
+        return (
+            self.counts[selected].sum(axis=(0, 1)),
+            int(self.calm[selected].sum()),
+            int(self.hours[selected].sum()),
+        )
+
+    def rose(self, month, hour):
+        """Return the percentage of the hours in the month and hour ranges in each
+        direction sector and speed bin, an array of shape (16, speed bins).
+
+        The first speed bin holds the calm hours spread evenly over the directions.
+        """
+        counts, calm, hours = self.window(month, hour)
+        rose = counts.T.astype(float)
+        rose[:, 0] = calm / rose.shape[0]
+        return rose / max(hours, 1) * 100
+
+
+def wind_rose_histogram(df, si_ip, month=(1, 12), hour=(1, 24)):
+    """Return the wind rose of the month and hour ranges of a dataset as a JSON
+    serializable dictionary, with the same frequencies as the wind rose chart."""
+    cube = wind_cube(df, si_ip)
+    bins = cube.speed_bins
+    return {
+        "direction": sector_directions.tolist(),
+        # the last bin is open, its upper bound is null since JSON has no infinity
+        "speed_bins": [
+            [float(left), None if np.isinf(right) else float(right)]
+            for left, right in zip(bins[:-1], bins[1:])
+        ],
+        "frequency": np.round(cube.rose(month, hour), 4).tolist(),
+    }
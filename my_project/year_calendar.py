@@ -0,0 +1,61 @@
+import functools
+from datetime import timedelta
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from my_project.global_scheme import month_lst
+
+hours_per_year = 8760
+
+# columns of the datasets that only depend on the hour of the year, they are taken
+# from the shared calendar table instead of being computed and stored per dataset
+calendar_columns = ["DOY", "month_names", "UTC_time"]
+
+
+@functools.lru_cache(maxsize=None)
+def calendar_table():
+    """Return the read-only calendar of the 8760 hours of a non-leap year.
+
+    The table maps the month, day, hour (1 to 24 as in EPW files), day of the year,
+    month index (0 to 11), month name and UTC time columns to arrays with one value
+    per hour. It is shared by all the datasets and its numeric arrays are read-only.
+    """
+    utc_time = pd.date_range(
+        "2019-01-01 00:00:00", "2020-01-01", inclusive="left", freq="h", tz="UTC"
+    )
+    month_index = utc_time.month.to_numpy(dtype=np.int64) - 1
+    table = {
+        "month": month_index + 1,
+        "day": utc_time.day.to_numpy(dtype=np.int64),
+        "hour": utc_time.hour.to_numpy(dtype=np.int64) + 1,
+        "DOY": utc_time.dayofyear.to_numpy(dtype=np.int64),
+        "month_index": month_index,
+        "month_names": np.array(month_lst, dtype=object)[month_index],
+    }
+    for values in table.values():
+        # pandas can not compute the deep memory usage of read-only object arrays
+        if values.dtype != object:
+            values.flags.writeable = False
+    # a DatetimeIndex is immutable
+    table["UTC_time"] = utc_time
+    return MappingProxyType(table)
+
+
+@functools.lru_cache(maxsize=None)
+def local_times(time_zone):
+    """Return the times of the hours of the year in a time zone, shifted by one hour
+    as in the EPW files where hour 1 is the hour ending at 1:00."""
+    return calendar_table()["UTC_time"] - timedelta(hours=time_zone - 1)
+
+
+def with_calendar(df):
+    """Return df, which has one row per hour of the year, with the calendar columns
+    appended. The columns share the memory of the calendar table."""
+    calendar = calendar_table()
+    data = {col: df[col] for col in df.columns}
+    data.update((col, calendar[col]) for col in calendar_columns)
+    # building the dataframe from a dict does not consolidate the columns, so no
+    # column is copied
+    return pd.DataFrame(data, index=df.index, copy=False)
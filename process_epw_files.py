@@ -0,0 +1,125 @@
+"""Compute the clima dataset of every EPW file in a directory or zip archive and save
+each one in a columnar dataset, with an index.csv file summarizing them.
+
+Files that have already been processed are skipped, so an interrupted run can be
+resumed by running the same command again.
+
+Usage:
+    python process_epw_files.py INPUT_DIR_OR_ZIP OUTPUT_DIR [--workers N]
+"""
+
+import argparse
+import csv
+import hashlib
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from my_project.column_store import ColumnStore
+from my_project.epw_download import decode_epw
+from my_project.extract_df import create_df
+
+index_columns = ["key", "file", "city", "state", "country", "lat", "lon", "period"]
+
+
+def find_epw_files(input_path):
+    """Return the paths of the EPW files in a directory, or the names of the EPW
+    files in a zip archive, relative to input_path."""
+    if zipfile.is_zipfile(input_path):
+        with zipfile.ZipFile(input_path) as zf:
+            names = [name for name in zf.namelist() if name.lower().endswith(".epw")]
+    else:
+        names = [
+            os.path.relpath(os.path.join(root, name), input_path)
+            for root, _, files in os.walk(input_path)
+            for name in files
+            if name.lower().endswith(".epw")
+        ]
+    return sorted(names)
+
+
+def dataset_key(name):
+    """Return the key of the dataset of an EPW file from its relative path.
+
+    The key is the path with the characters that are not valid in a file name
+    replaced, followed by a short hash of the path so that different paths never
+    share a key.
+    """
+    path = name.replace(os.sep, "/")
+    readable = re.sub(r"[^\w.-]", "_", os.path.splitext(path)[0].replace("/", "__"))
+    return f"{readable}-{hashlib.sha256(path.encode()).hexdigest()[:8]}"
+
+
+def process_epw_file(input_path, name, output_dir):
+    """Compute and save the dataset of one EPW file, return the time it took and the
+    error message if it failed."""
+    start = time.perf_counter()
+    try:
+        if zipfile.is_zipfile(input_path):
+            with zipfile.ZipFile(input_path) as zf:
+                content = zf.read(name)
+        else:
+            with open(os.path.join(input_path, name), "rb") as f:
+                content = f.read()
+        df, location_info = create_df(decode_epw(content), name)
+        ColumnStore(output_dir).write(dataset_key(name), df, location_info)
+    except Exception as e:
+        return time.perf_counter() - start, f"{type(e).__name__}: {e}"
+    return time.perf_counter() - start, None
+
+
+def write_index(output_dir, names):
+    """Write index.csv with the location info of the datasets saved in output_dir."""
+    store = ColumnStore(output_dir)
+    tmp_path = os.path.join(output_dir, "index.csv.tmp")
+    with open(tmp_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=index_columns, extrasaction="ignore")
+        writer.writeheader()
+        for name in names:
+            value = store.read(dataset_key(name), columns=[])
+            if value is not None:
+                writer.writerow(dict(value[1], key=dataset_key(name), file=name))
+    os.replace(tmp_path, os.path.join(output_dir, "index.csv"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", help="directory or zip archive with EPW files")
+    parser.add_argument("output", help="directory where the datasets are saved")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    args = parser.parse_args(argv)
+
+    names = find_epw_files(args.input)
+    store = ColumnStore(args.output)
+    todo = [name for name in names if not store.has(dataset_key(name))]
+    print(f"{len(names)} EPW files, {len(names) - len(todo)} already processed")
+
+    failures = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(process_epw_file, args.input, name, args.output): name
+            for name in todo
+        }
+        for ix, future in enumerate(as_completed(futures), start=1):
+            seconds, error = future.result()
+            status = "ok" if error is None else f"FAILED ({error})"
+            print(
+                f"[{ix}/{len(todo)}] {seconds:6.2f} s  {status}  {futures[future]}",
+                flush=True,
+            )
+            failures += error is not None
+
+    write_index(args.output, names)
+    print(
+        f"Processed {len(todo) - failures} of {len(todo)} EPW files in "
+        f"{time.perf_counter() - start:.1f} s"
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
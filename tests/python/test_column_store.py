@@ -0,0 +1,30 @@
+import pandas as pd
+
+from my_project.column_store import ColumnStore
+from my_project.extract_df import create_df
+from test_extract_df import import_epw_lines
+
+
+def test_column_store_round_trip(tmp_path):
+    df, location_info = create_df(import_epw_lines(), "file.epw")
+    store = ColumnStore(str(tmp_path))
+    store.write("key", df, location_info)
+
+    df_read, metadata = store.read("key")
+    pd.testing.assert_frame_equal(df_read, df)
+    assert metadata == location_info
+
+    df_read, _ = store.read("key", columns=["hour", "DBT"])
+    assert list(df_read.columns) == ["hour", "DBT"]
+    assert df_read["DBT"].equals(df["DBT"])
+    assert store.read("missing") is None
+
+
+def test_column_store_missing_strings(tmp_path):
+    df = pd.DataFrame({"name": ["Bologna", None, float("nan"), "None", "nan"]})
+    store = ColumnStore(str(tmp_path))
+    store.write("key", df)
+
+    df_read, _ = store.read("key")
+    assert df_read["name"].isna().tolist() == [False, True, True, False, False]
+    assert df_read["name"][[0, 3, 4]].tolist() == ["Bologna", "None", "nan"]
@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from my_project.blob_store import BlobStore, epw_digest
+from my_project.dataset_cache import DatasetCache
+from my_project.units import to_units
+from test_extract_df import import_epw_lines
+
+
+def test_get_or_create_returns_cached_dataset(tmp_path):
+    cache = DatasetCache(cache_dir=str(tmp_path), max_disk_bytes=2**30)
+    lines = import_epw_lines()
+
+    df, location_info = cache.get_or_create(lines, "first.epw")
+    df_cached, location_info_cached = cache.get_or_create(lines, "second.epw")
+
+    # callers share the memory of the cached dataset but not the dataframe
+    assert df_cached is not df
+    assert np.shares_memory(df_cached["DBT"].to_numpy(), df["DBT"].to_numpy())
+    with pytest.raises(ValueError):
+        df.loc[df.index[:10], "DBT"] = None
+    assert location_info["url"] == "first.epw"
+    assert location_info_cached["url"] == "second.epw"
+    assert location_info_cached["city"] == location_info["city"]
+
+    # a new process only finds the pickled dataset on disk
+    df_disk, _ = DatasetCache(cache_dir=str(tmp_path)).get_or_create(lines, "x.epw")
+    assert df_disk.equals(df)
+
+
+def test_lru_eviction(tmp_path):
+    cache = DatasetCache(cache_dir=str(tmp_path), max_memory_bytes=1, max_disk_bytes=1)
+    lines = import_epw_lines()
+    lines_other = lines[:5] + ["COMMENTS 1,other"] + lines[6:]
+
+    cache.get_or_create(lines, "first.epw")
+    cache.get_or_create(lines_other, "second.epw")
+
+    assert list(cache._entries) == [cache.key(epw_digest(lines_other))]
+    assert os.listdir(tmp_path) == [f"{cache.key(epw_digest(lines_other))}.columns"]
+
+
+def test_columns_are_read_from_column_store(tmp_path):
+    lines = import_epw_lines()
+    df, _ = DatasetCache(cache_dir=str(tmp_path), max_disk_bytes=2**30).get_or_create(
+        lines, "first.epw"
+    )
+
+    cache = DatasetCache(cache_dir=str(tmp_path), max_memory_bytes=0)
+    columns = ["wind_speed", "wind_dir", "month", "hour"]
+    df_columns = cache.columns(epw_digest(lines), columns, "ip")
+
+    assert list(df_columns.columns) == columns
+    assert df_columns["month"].equals(df["month"])
+    assert not df_columns["month"].to_numpy().flags.writeable
+    assert df_columns["wind_speed"].equals(to_units(df, "ip")["wind_speed"])
+
+
+def test_blob_store(tmp_path):
+    store = BlobStore(cache_dir=str(tmp_path))
+    lines = import_epw_lines()
+
+    digest = store.put(lines)
+    assert digest == epw_digest(lines)
+    assert store.get(digest) == lines
+    assert store.get("0" * 64) is None
+    assert store.get("../" + digest) is None
+
+
+def test_import_creates_no_cache_directory(tmp_path):
+    # the stores of the app are created relative to the working directory
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    subprocess.run(
+        [sys.executable, "-c", "import my_project.dataset_cache, my_project.utils"],
+        cwd=tmp_path,
+        env=dict(os.environ, PYTHONPATH=root),
+        check=True,
+    )
+    assert not os.path.exists(tmp_path / "cache")
@@ -0,0 +1,105 @@
+import json
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from my_project.blob_store import epw_store
+from my_project.column_store import ColumnStore
+from my_project.dataset_cache import DatasetCache, dataset_cache
+from my_project.dataset_metrics import parse_range, time_mask
+from my_project.extract_df import create_df
+from my_project.wind_cube import wind_cube
+from test_extract_df import import_epw_lines
+
+
+def test_time_filters():
+    df, _ = create_df(import_epw_lines(), "x.epw")
+
+    assert parse_range(None, 1, 12) == (1, 12)
+    assert parse_range("11-2", 1, 12) == (11, 2)
+    with pytest.raises(ValueError):
+        parse_range("0-5", 1, 12)
+
+    mask = time_mask(df, (11, 2), (1, 24))
+    assert set(df.loc[mask, "month"]) == {11, 12, 1, 2}
+    assert time_mask(df, (1, 12), (13, 13)).sum() == 365
+
+
+def float_error(value):
+    raise ValueError(value)
+
+
+def test_dataset_metric_api(monkeypatch, tmp_path):
+    from my_project.api import api_dataset_metric, server
+
+    # keep the EPW and the dataset of the test out of the cache of the app
+    monkeypatch.setattr(epw_store, "cache_dir", str(tmp_path / "epw"))
+    monkeypatch.setattr(dataset_cache, "cache_dir", str(tmp_path / "datasets"))
+    monkeypatch.setattr(dataset_cache, "store", ColumnStore(dataset_cache.cache_dir))
+    (tmp_path / "epw").mkdir()
+    lines = import_epw_lines()
+    digest = epw_store.put(lines)
+    df, _ = create_df(lines, "x.epw")
+
+    url = f"/api/datasets/{digest}/utci?columns=utci_Sun_Wind&month=7&hour=12-13"
+    with server.test_request_context(url):
+        response = api_dataset_metric(digest, "utci")
+    data = response.get_json()["data"]
+    assert list(data) == ["month", "day", "hour", "utci_Sun_Wind"]
+    assert len(data["utci_Sun_Wind"]) == 31 * 2
+    assert np.isclose(
+        max(data["utci_Sun_Wind"]),
+        df.query("month == 7 and 12 <= hour <= 13")["utci_Sun_Wind"].max(),
+    )
+
+    with server.test_request_context(
+        url, headers={"If-None-Match": response.get_etag()[0]}
+    ):
+        assert api_dataset_metric(digest, "utci").status_code == 304
+
+    with server.test_request_context("/api/datasets/x/degree-days?hdd=15"):
+        days = api_dataset_metric(digest, "degree-days").get_json()
+    assert days["hdd"][0] < 0 and days["cdd"][0] == 0 and len(days["cdd"]) == 12
+
+    with server.test_request_context("/api/datasets/x/wind-rose?month=12-2"):
+        response = api_dataset_metric(digest, "wind-rose")
+    # strict JSON, without the Infinity and NaN extensions
+    rose = json.loads(response.get_data(as_text=True), parse_constant=float_error)
+    assert rose["speed_bins"][-1] == [20.7, None]
+    # the same rose as the wind tab
+    expected = wind_cube(df, "si").rose((12, 2), (1, 24))
+    assert np.allclose(rose["frequency"], expected, atol=1e-4)
+
+    with server.test_request_context("/api/datasets/x/utci?columns=DBT"):
+        assert api_dataset_metric(digest, "utci")[1] == 400
+    with server.test_request_context("/api/datasets/x/utci"):
+        assert api_dataset_metric("x", "utci")[1] == 404
+
+
+def test_dataset_metric_api_evicted_station(monkeypatch, tmp_path):
+    from my_project import api
+
+    monkeypatch.setattr(epw_store, "cache_dir", str(tmp_path / "epw"))
+    monkeypatch.setattr(api, "dataset_cache", DatasetCache(str(tmp_path / "1")))
+    monkeypatch.setattr(api, "_station_digests", {})
+    (tmp_path / "epw").mkdir()
+    downloads = []
+
+    def get_data(url):
+        downloads.append(url)
+        return import_epw_lines()
+
+    monkeypatch.setattr(api, "get_data", get_data)
+    url = "/api/datasets/0/degree-days"
+    with api.server.test_request_context(url):
+        assert api.api_dataset_metric("0", "degree-days").status_code == 200
+
+    # the EPW and the dataset are evicted, the station is downloaded again
+    for file_path in (tmp_path / "epw").iterdir():
+        file_path.unlink()
+    monkeypatch.setattr(api, "dataset_cache", DatasetCache(str(tmp_path / "2")))
+    monkeypatch.setattr(api, "_responses", OrderedDict())
+    with api.server.test_request_context(url):
+        assert api.api_dataset_metric("0", "degree-days").status_code == 200
+    assert len(downloads) == 2
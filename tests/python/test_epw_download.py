@@ -0,0 +1,90 @@
+import functools
+import gzip
+import http.server
+import tempfile
+import threading
+import zipfile
+
+import pytest
+
+from my_project import extract_df
+from my_project.epw_download import (
+    DownloadError,
+    download,
+    download_epw_lines,
+    is_epw,
+)
+from my_project.epw_mirror import EpwMirror
+from test_extract_df import epw_test_file_path, import_epw_lines
+
+
+@pytest.fixture
+def epw_server(tmp_path):
+    """Serve an EPW file and a zip archive containing it from a local server."""
+    with zipfile.ZipFile(tmp_path / "station.zip", "w") as zf:
+        zf.write(epw_test_file_path, "station.epw")
+        zf.writestr("station.stat", "statistics")
+    (tmp_path / "station.epw").write_bytes(open(epw_test_file_path, "rb").read())
+
+    handler = functools.partial(
+        http.server.SimpleHTTPRequestHandler, directory=str(tmp_path)
+    )
+    handler.log_message = lambda *args: None
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_download_epw_lines(epw_server):
+    lines = [line.rstrip("\r") for line in import_epw_lines()]
+    lines = lines[:-1] if lines[-1] == "" else lines
+
+    assert download_epw_lines(f"{epw_server}/station.zip") == lines
+    assert download_epw_lines(f"{epw_server}/station.epw") == lines
+
+
+def test_download_errors(epw_server, monkeypatch):
+    files = []
+    spooled_temporary_file = tempfile.SpooledTemporaryFile
+
+    def spooled_file(**kwargs):
+        files.append(spooled_temporary_file(**kwargs))
+        return files[-1]
+
+    monkeypatch.setattr(tempfile, "SpooledTemporaryFile", spooled_file)
+    with pytest.raises(DownloadError):
+        download_epw_lines(f"{epw_server}/missing.zip")
+    with pytest.raises(DownloadError):
+        download(f"{epw_server}/station.epw", max_bytes=1000)
+    # the temporary files of failed downloads are closed
+    assert len(files) == 2 and all(f.closed for f in files)
+
+
+def test_epw_mirror(tmp_path):
+    mirror = EpwMirror(str(tmp_path))
+    url = "https://climate.onebuilding.org/station.zip"
+    content = open(epw_test_file_path, "rb").read()
+
+    assert mirror.get(url) is None
+    mirror.put(url, content)
+    assert mirror.get(url) == content
+
+    # corrupted files are discarded
+    (file_path,) = tmp_path.iterdir()
+    data = file_path.read_bytes()
+    file_path.write_bytes(data[:65] + gzip.compress(b"LOCATION"))
+    assert mirror.get(url) is None
+    assert not file_path.exists()
+
+
+def test_get_data_mirrors_epw_files_only(epw_server, tmp_path, monkeypatch):
+    mirror = EpwMirror(str(tmp_path / "mirror"))
+    monkeypatch.setattr(extract_df, "epw_mirror", mirror)
+    (tmp_path / "portal.epw").write_text("<html>Sign in to the network</html>")
+
+    assert is_epw(extract_df.get_data(f"{epw_server}/station.epw"))
+    assert mirror.get(f"{epw_server}/station.epw") is not None
+    # an error page returned with status 200 is neither used nor mirrored
+    assert extract_df.get_data(f"{epw_server}/portal.epw") is None
+    assert mirror.get(f"{epw_server}/portal.epw") is None
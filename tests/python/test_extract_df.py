@@ -0,0 +1,54 @@
+import os
+
+from pythermalcomfort.utilities import running_mean_outdoor_temperature
+
+from my_project.extract_df import (
+    read_epw_data,
+    epw_col_names,
+    running_mean_outdoor_temperatures,
+)
+
+epw_test_file_path = os.path.join(
+    os.path.dirname(__file__), "ITA_ER_Bologna-Marconi.AP.161400_TMYx.2004-2018.epw"
+)
+
+
+def import_epw_lines():
+    with open(epw_test_file_path, encoding="utf-8") as epw_file:
+        return epw_file.read().split("\n")
+
+
+def test_read_epw_data():
+    lines = import_epw_lines()
+    df = read_epw_data(lines)
+
+    assert df.shape == (8760, len(epw_col_names))
+    assert list(df.columns) == epw_col_names
+    assert df["hour"].dtype == int
+    assert df["DBT"].dtype == float
+
+    first_row = lines[8].strip().split(",")
+    assert df["DBT"].iloc[0] == float(first_row[6])
+    assert df["hor_ir_rad"].iloc[0] == float(first_row[12])
+    assert df["DaySSnow"].iloc[0] == float(first_row[31])
+
+
+def test_read_epw_data_missing_columns():
+    lines = import_epw_lines()
+    lines = lines[:8] + [",".join(line.split(",")[:30]) for line in lines[8:8768]]
+    df = read_epw_data(lines)
+
+    assert list(df.columns) == epw_col_names
+    assert (df["DaySSnow"] == 9999).all()
+    assert (df["Pwater"] == 9999).all()
+
+
+def test_running_mean_outdoor_temperatures():
+    dbt_day_ave = read_epw_data(import_epw_lines()).groupby(["month", "day"])["DBT"]
+    dbt_day_ave = dbt_day_ave.mean().values
+    rmt = running_mean_outdoor_temperatures(dbt_day_ave, alpha=0.9, n=7)
+
+    assert rmt.shape == (365,)
+    for day in [0, 3, 6, 7, 200, 364]:
+        last_days = [dbt_day_ave[(day - ix) % 365] for ix in range(1, 8)]
+        assert rmt[day] == running_mean_outdoor_temperature(last_days, alpha=0.9)
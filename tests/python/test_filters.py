@@ -0,0 +1,33 @@
+import numpy as np
+
+from my_project.extract_df import create_df
+from my_project.filters import masked, month_hour_mask, range_mask
+from test_extract_df import import_epw_lines
+
+
+def test_month_hour_mask():
+    df, _ = create_df(import_epw_lines(), "x.epw")
+
+    mask = month_hour_mask([3, 8], [6, 18], [], [])
+    expected = df["month"].between(3, 8) & df["hour"].between(6, 18)
+    assert (mask == expected).all()
+    assert mask is month_hour_mask([3, 8], [6, 18], [], [])
+    assert not mask.flags.writeable
+
+    # inverted ranges exclude the selected months and hours
+    mask = month_hour_mask([3, 8], [6, 18], ["invert"], ["invert"])
+    expected = ~df["month"].between(3, 8) & ~df["hour"].between(6, 18)
+    assert (mask == expected).all()
+
+
+def test_masked_does_not_modify_the_dataset():
+    df, _ = create_df(import_epw_lines(), "x.epw")
+    dbt = df["DBT"].copy()
+
+    mask = range_mask(df["RH"], 40, 60)
+    filtered = masked(df, mask, ["DBT"])
+    assert filtered["DBT"].isna().sum() == (~df["RH"].between(40, 60)).sum()
+    assert df["DBT"].equals(dbt)
+    assert np.shares_memory(filtered["RH"].to_numpy(), df["RH"].to_numpy())
+
+    assert (range_mask(df["RH"], 60, 40) == ~df["RH"].between(40, 60)).all()
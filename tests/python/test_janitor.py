@@ -0,0 +1,58 @@
+import os
+import time
+
+from my_project.janitor import Janitor
+from my_project.serverside_backend import TwoTierBackend
+
+
+def write_file(dir_path, name, size, age):
+    file_path = os.path.join(dir_path, name)
+    with open(file_path, "wb") as f:
+        f.write(b"0" * size)
+    last_access = time.time() - age
+    os.utime(file_path, (last_access, last_access))
+
+
+def test_sweep(tmp_path):
+    write_file(tmp_path, "expired", 10, age=100)
+    write_file(tmp_path, "old", 10, age=30)
+    write_file(tmp_path, "new", 10, age=20)
+    write_file(tmp_path, "newest", 10, age=10)
+    write_file(tmp_path, "count", 10, age=1000)
+
+    janitor = Janitor(str(tmp_path), max_bytes=25, ttl=60, skip=lambda n: n == "count")
+    metrics = janitor.sweep()
+
+    assert sorted(os.listdir(tmp_path)) == ["count", "new", "newest"]
+    assert metrics["entries"] == 2
+    assert metrics["bytes"] == 20
+    assert metrics["expired"] == 1
+    assert metrics["evicted"] == 1
+
+
+def test_sweep_temporary_files(tmp_path):
+    write_file(tmp_path, "crashed.tmp", 10, age=100)
+    write_file(tmp_path, "writing.tmp", 10, age=0)
+    write_file(tmp_path, "old", 10, age=30)
+
+    janitor = Janitor(
+        str(tmp_path), max_bytes=15, ttl=60, temporary=lambda n: n.endswith(".tmp")
+    )
+    metrics = janitor.sweep()
+
+    # the expired temporary file is deleted, the one being written is not evicted
+    assert sorted(os.listdir(tmp_path)) == ["writing.tmp"]
+    assert metrics["expired"] == 1 and metrics["evicted"] == 1
+
+
+def test_serverside_janitor_files(tmp_path):
+    backend = TwoTierBackend(cache_dir=str(tmp_path))
+    count_file = os.path.basename(backend._get_filename(backend._fs_count_file))
+    value_file = os.path.basename(backend._get_filename("df"))
+
+    # the janitor keeps the count file and collects the stale transaction files
+    assert backend._is_count_file(count_file)
+    assert not backend._is_count_file("write.__wz_cache")
+    assert backend._is_transaction_file("write.__wz_cache")
+    assert not backend._is_count_file(value_file)
+    assert not backend._is_transaction_file(value_file)
@@ -0,0 +1,39 @@
+import csv
+import os
+import shutil
+
+from my_project.column_store import ColumnStore
+from process_epw_files import dataset_key, main
+
+epw_file = os.path.join(
+    os.path.dirname(__file__), "ITA_ER_Bologna-Marconi.AP.161400_TMYx.2004-2018.epw"
+)
+
+
+def test_dataset_key():
+    names = ["a/b.epw", "a__b.epw", "a b.epw", "a_b.epw"]
+    keys = [dataset_key(name) for name in names]
+    assert len(set(keys)) == len(names)
+    assert keys[0].startswith("a__b-")
+
+
+def test_process_epw_files(tmp_path, capsys):
+    input_dir = tmp_path / "input"
+    (input_dir / "a").mkdir(parents=True)
+    names = ["a/b.epw", "a__b.epw", "a b.epw", "a_b.epw"]
+    for name in names:
+        shutil.copy(epw_file, input_dir / name)
+    output_dir = str(tmp_path / "output")
+
+    assert main([str(input_dir), output_dir, "--workers", "2"]) == 0
+    with open(os.path.join(output_dir, "index.csv")) as f:
+        index = list(csv.DictReader(f))
+    assert sorted(row["file"] for row in index) == sorted(names)
+    assert len({row["key"] for row in index}) == len(names)
+    store = ColumnStore(output_dir)
+    assert all(store.has(row["key"]) for row in index)
+
+    # a second run finds every dataset and processes nothing
+    capsys.readouterr()
+    assert main([str(input_dir), output_dir]) == 0
+    assert "4 EPW files, 4 already processed" in capsys.readouterr().out
@@ -0,0 +1,26 @@
+import numpy as np
+from pythermalcomfort import psychrometrics as psy
+
+from my_project.psychrometrics import psy_ta_rh
+
+
+def test_psy_ta_rh_matches_pythermalcomfort():
+    tdb = np.array([-40, -12.3, -0.1, 0, 7.5, 18.2, 25, 33.7, 45, 59])
+    rh = np.array([5, 100, 64, 50, 81, 12, 45, 73, 30, 10])
+
+    results = psy_ta_rh(tdb, rh)
+
+    for ix in range(len(tdb)):
+        expected = psy.psy_ta_rh(tdb[ix], rh[ix])
+        for key in ["p_sat", "p_vap", "hr", "h"]:
+            assert np.isclose(results[key][ix], expected[key])
+        for key in ["t_wb", "t_dp"]:
+            assert abs(results[key][ix] - expected[key]) <= 0.1
+
+
+def test_psy_ta_rh_broadcasts_scalar_rh():
+    tdb = np.arange(-60, 60, 1)
+    hr = psy_ta_rh(tdb, 50)["hr"]
+
+    assert hr.shape == tdb.shape
+    assert np.all(np.diff(hr) > 0)
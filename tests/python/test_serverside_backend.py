@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from my_project.serverside_backend import TwoTierBackend
+from my_project.shared_dataset import SharedDataset
+
+
+def test_two_tier_backend(tmp_path):
+    backend = TwoTierBackend(cache_dir=str(tmp_path), max_memory_bytes=2**20)
+    df = pd.DataFrame({"DBT": range(8760)}, dtype=float)
+    backend.set("df", df)
+
+    df_memory = backend.get("df", ignore_expired=True)
+    assert df_memory.equals(df)
+    with pytest.raises(ValueError):
+        df_memory.loc[:10, "DBT"] = None
+    df_memory["DBT"] = None
+    assert backend.get("df").equals(df)
+    assert backend.stats()["hits"] == 2
+
+    # setting a value again under the same key keeps the frame already shared
+    shared = backend.get("df")["DBT"].to_numpy()
+    backend.set("df", df.copy())
+    assert backend.stats()["entries"] == 1
+    assert np.shares_memory(backend.get("df")["DBT"].to_numpy(), shared)
+
+    # a new process only finds the value on disk
+    backend = TwoTierBackend(cache_dir=str(tmp_path), max_memory_bytes=2**20)
+    assert backend.get("df").equals(df)
+    assert backend.get("df").equals(df)
+    assert backend.stats()["misses"] == 1
+    assert backend.stats()["hits"] == 1
+
+
+def test_two_tier_backend_eviction(tmp_path):
+    df = pd.DataFrame({"DBT": range(8760)}, dtype=float)
+    nbytes = int(df.memory_usage(index=True, deep=True).sum())
+    backend = TwoTierBackend(cache_dir=str(tmp_path), max_memory_bytes=nbytes)
+    backend.set("first", df)
+    backend.set("second", df)
+
+    assert list(backend._entries) == ["second"]
+    assert backend.get("first").equals(df)
+    assert backend.stats()["misses"] == 1
+
+
+def test_two_tier_backend_shares_cached_datasets(tmp_path):
+    backend = TwoTierBackend(cache_dir=str(tmp_path), max_memory_bytes=2**20)
+    df = SharedDataset(pd.DataFrame({"DBT": range(8760)}, dtype=float)).view()
+    backend.set("df", df)
+    # the read-only columns of the dataset cache are shared instead of copied
+    assert np.shares_memory(backend.get("df")["DBT"].to_numpy(), df["DBT"].to_numpy())
+
+    # the writable columns are copied so the caller cannot modify the cached value
+    df = pd.DataFrame({"DBT": range(8760)}, dtype=float)
+    backend.set("df-copy", df)
+    assert not np.shares_memory(
+        backend.get("df-copy")["DBT"].to_numpy(), df["DBT"].to_numpy()
+    )
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from my_project.shared_dataset import SharedDataset
+
+
+def test_shared_dataset():
+    df = pd.DataFrame(
+        {
+            "DBT": np.arange(24, dtype=float),
+            "hour": np.arange(1, 25),
+            "season": pd.Categorical(["winter"] * 12 + ["summer"] * 12),
+            "month_names": ["Jan"] * 24,
+            "times": pd.date_range("2019-01-01", periods=24, freq="h"),
+        }
+    )
+    shared = SharedDataset(df)
+    first, second = shared.view(), shared.view()
+    assert first.equals(df)
+    assert np.shares_memory(first["DBT"].to_numpy(), second["DBT"].to_numpy())
+
+    # the shared columns can not be written in place
+    with pytest.raises(ValueError):
+        first.loc[first.index[:3], "DBT"] = 0
+    with pytest.raises(ValueError):
+        first["hour"].to_numpy()[0] = 0
+
+    # the object and datetime columns are copied in each view
+    first.loc[first.index[0], "month_names"] = "Feb"
+    first.loc[first.index[0], "times"] = pd.Timestamp("2020-01-01")
+    assert second["month_names"].iloc[0] == "Jan"
+    assert second["times"].iloc[0] == pd.Timestamp("2019-01-01")
+
+    # replaced and added columns only exist in their view
+    first["DBT"] = first["DBT"] + 1
+    first["RH"] = 50.0
+    assert second["DBT"].equals(df["DBT"])
+    assert "RH" not in second and "RH" not in shared.view()
+    assert shared.view().equals(df)
@@ -0,0 +1,29 @@
+import numpy as np
+from pythermalcomfort.models import solar_gain as pythermalcomfort_solar_gain
+
+from my_project.solar_gain import solar_gain
+
+
+def test_solar_gain_matches_pythermalcomfort():
+    sol_altitude = np.array([0, 7.5, 15, 33.3, 45, 61.2, 89.9, 90])
+    sol_radiation_dir = np.array([0, 120, 350, 500, 640, 800, 910, 1000])
+
+    for posture in ["standing", "seated", "supine"]:
+        for sharp in [0, 45, 100, 180]:
+            results = solar_gain(
+                sol_altitude=sol_altitude,
+                sharp=sharp,
+                sol_radiation_dir=sol_radiation_dir,
+                sol_transmittance=1,
+                f_svv=1,
+                f_bes=1,
+                asw=0.7,
+                posture=posture,
+                floor_reflectance=0.6,
+            )
+            for ix, altitude in enumerate(sol_altitude):
+                expected = pythermalcomfort_solar_gain(
+                    altitude, sharp, sol_radiation_dir[ix], 1, 1, 1, 0.7, posture, 0.6
+                )
+                assert abs(results["erf"][ix] - expected["erf"]) <= 0.1
+                assert abs(results["delta_mrt"][ix] - expected["delta_mrt"]) <= 0.1
@@ -0,0 +1,38 @@
+import os
+
+from my_project import station_catalog
+from my_project.station_catalog import load_catalog, sources
+
+
+def test_load_catalog(tmp_path):
+    catalog = load_catalog(cache_dir=str(tmp_path))
+
+    assert load_catalog(cache_dir=str(tmp_path)) is catalog
+    assert load_catalog(cache_dir=str(tmp_path), check_sources=True) is catalog
+    assert catalog["lat"].dtype == float
+    assert catalog["source"].max() == len(sources) - 1
+    assert catalog["url"].str.startswith("http").all()
+
+    one_building = catalog[catalog["source"] == 1]
+    assert one_building["url"].iloc[0] == (
+        "https://climate.onebuilding.org/WMO_Region_1_Africa/AGO_Angola/"
+        "AGO_CAB_Cabinda.AP.661040_TMYx.2004-2018.zip"
+    )
+    assert one_building["time_zone"].dropna().between(-12, 14).all()
+
+
+def test_load_catalog_check_sources(tmp_path, monkeypatch):
+    catalog = load_catalog(cache_dir=str(tmp_path / "catalog"))
+
+    # a station file newer than the catalog is only noticed when the sources are
+    # checked
+    source = tmp_path / "one_building.csv"
+    source.write_bytes(open(station_catalog.one_building_file, "rb").read())
+    modified = os.path.getmtime(tmp_path / "catalog") + 10
+    os.utime(source, (modified, modified))
+    monkeypatch.setattr(station_catalog, "one_building_file", str(source))
+    assert load_catalog(cache_dir=str(tmp_path / "catalog")) is catalog
+
+    rebuilt = load_catalog(cache_dir=str(tmp_path / "catalog"), check_sources=True)
+    assert rebuilt is not catalog
+    assert rebuilt.equals(catalog)
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from my_project.station_index import StationIndex, nearest_stations
+
+
+def test_station_index():
+    catalog = pd.DataFrame(
+        {"lat": [0.0, 0.0, 10.0], "lon": [179.9, 10.0, 10.0]}, index=[10, 11, 12]
+    )
+    ids, distance = StationIndex(catalog).nearest(0, -179.9, k=2)
+
+    # the nearest station is on the other side of the antimeridian
+    assert list(ids) == [10, 12]
+    assert np.isclose(distance[0], 22.239, atol=0.01)
+
+
+def test_nearest_stations_api():
+    from my_project.api import api_nearest_stations, server
+
+    stations = nearest_stations(44.53, 11.29, k=3)
+    assert "Bologna" in stations[0]["name"]
+    assert stations[0]["distance_km"] <= stations[-1]["distance_km"] < 10
+
+    with server.test_request_context("/api/stations/nearest?lat=44.53&lon=11.29&k=3"):
+        assert api_nearest_stations().get_json()["stations"] == stations
+    with server.test_request_context("/api/stations/nearest?lat=x"):
+        assert api_nearest_stations()[1] == 400
@@ -0,0 +1,63 @@
+import pandas as pd
+
+from my_project.station_map import (
+    StationClusters,
+    max_cluster_zoom,
+    station_map_figure,
+    view_from_relayout,
+)
+
+
+def test_station_clusters():
+    catalog = pd.DataFrame(
+        {
+            "lat": [45.0, 45.001, 45.002, -33.9, 64.1],
+            "lon": [179.99, -179.99, 179.98, 18.6, -21.9],
+        }
+    )
+    clusters = StationClusters(catalog)
+
+    for level in clusters.levels:
+        assert level["count"].sum() == len(catalog)
+
+    single, in_view = clusters.in_view(0)
+    assert sorted(single) == [1, 3, 4]
+    assert list(in_view["count"]) == [2]
+
+    # the view crosses the antimeridian
+    single, in_view = clusters.in_view(max_cluster_zoom + 1, (179, 40, -179, 50))
+    assert list(single) == [0, 1, 2]
+    assert in_view is None
+
+
+def test_station_map_figure():
+    relayout_data = {
+        "mapbox.center": {"lat": 44.5, "lon": 11.3},
+        "mapbox.zoom": 6.5,
+        "mapbox._derived": {
+            "coordinates": [[5, 48], [17, 48], [17, 41], [5, 41]],
+        },
+    }
+    zoom, center, bounds = view_from_relayout(relayout_data)
+    catalog = pd.DataFrame(
+        {
+            "name": ["Bologna", "Cape Town"],
+            "lat": [44.5, -33.9],
+            "lon": [11.3, 18.6],
+            "elevation": [37.0, 42.0],
+            "time_zone": [1.0, 2.0],
+            "source": [0, 1],
+            "url": ["https://a.epw", "https://b.zip"],
+            "period": ["", "2004-2018"],
+            "heating_db": [float("nan"), 5.1],
+            "cooling_db": [float("nan"), 29.2],
+        }
+    )
+    figure = station_map_figure(StationClusters(catalog), zoom, center, bounds)
+
+    assert figure["layout"]["mapbox"]["zoom"] == 6.5
+    energyplus, one_building = figure["data"][1:]
+    assert energyplus["hovertext"] == ["Bologna"]
+    assert energyplus["customdata"][0][0] == 0
+    assert one_building["lat"] == []
+    assert view_from_relayout({"autosize": True}) is None
@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+
+from my_project.blob_store import epw_digest
+from my_project.dataset_cache import DatasetCache
+from my_project.extract_df import create_df
+from my_project.stats_cube import stats_cube
+from my_project.units import to_units
+from test_extract_df import import_epw_lines
+
+percentiles = [0.01, 0.25, 0.5, 0.75, 0.99]
+
+
+def test_stats_cube():
+    df, _ = create_df(import_epw_lines(), "x.epw")
+    df.iloc[10, df.columns.get_loc("RH")] = np.nan
+    cube = stats_cube(df)
+
+    median = df.groupby(["month", "hour"])["DBT"].median().to_numpy()
+    assert np.allclose(cube.get("DBT", "50%", "month_hour"), median.reshape(12, 24))
+    day_max = df.groupby("DOY")["glob_hor_rad"].max().to_numpy()
+    assert np.allclose(cube.get("glob_hor_rad", "max", "doy"), day_max)
+
+    describe = df.groupby("month")["RH"].describe(percentiles=percentiles)
+    assert np.allclose(cube.describe("RH", "month"), describe)
+    assert cube.get("RH", "count", "year") == 8759
+
+    describe = to_units(df, "ip").groupby("month")["DBT"].describe(percentiles)
+    assert np.allclose(cube.to_units("ip").describe("DBT", "month"), describe)
+
+
+def test_stats_cube_is_saved_with_dataset(tmp_path):
+    lines = import_epw_lines()
+    cache = DatasetCache(cache_dir=str(tmp_path), max_disk_bytes=2**30)
+    cache.get_or_create(lines, "x.epw")
+    cube = cache.stats(epw_digest(lines), "ip")
+    assert os.listdir(tmp_path) == [f"{cache.key(epw_digest(lines))}.columns"]
+
+    cube_disk = DatasetCache(cache_dir=str(tmp_path)).stats(epw_digest(lines), "ip")
+    assert cube_disk.table.equals(cube.table)
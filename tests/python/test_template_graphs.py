@@ -0,0 +1,18 @@
+import numpy as np
+
+from my_project.extract_df import create_df
+from my_project.template_graphs import heatmap
+from test_extract_df import import_epw_lines
+
+
+def test_heatmap_is_a_matrix_of_days_and_hours():
+    df, _ = create_df(import_epw_lines(), "x.epw")
+    trace = heatmap(df, "DBT", "global", "si").data[0]
+
+    assert len(trace.x) == 365 and trace.x[0] == "2019-01-01"
+    assert trace.y == tuple(range(1, 25))
+    assert trace.customdata is None
+    z = np.asarray(trace.z)
+    assert z.shape == (24, 365)
+    day = df.loc[(df["month"] == 2) & (df["day"] == 3)]
+    assert (z[:, 33] == day["DBT"].to_numpy()).all()
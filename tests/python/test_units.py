@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from my_project.units import to_units
+
+
+def test_to_units_does_not_modify_si_dataframe():
+    df = pd.DataFrame(
+        {
+            "DBT": [0.0, 10.0, -40.0],
+            "p_atm": [101325.0, 100000.0, 99000.0],
+            "RH": [50.0, 60.0, 70.0],
+            "adaptive_cmf_rmt": [20.0, 21.0, 22.0],
+        }
+    )
+    df_si = df.copy()
+
+    df_ip = to_units(df, "ip")
+
+    assert df.equals(df_si)
+    assert np.allclose(df_ip["DBT"], [32, 50, -40])
+    assert np.allclose(df_ip["p_atm"], df["p_atm"] * 0.000145038)
+    assert df_ip["RH"].equals(df["RH"])
+    assert df_ip["adaptive_cmf_rmt"].equals(df["adaptive_cmf_rmt"])
+
+
+def test_to_units_selected_columns():
+    df = pd.DataFrame({"DBT": [0.0, 100.0], "wind_speed": [1.0, 2.0]})
+
+    assert list(to_units(df, "ip", ["wind_speed"]).columns) == ["wind_speed"]
+    assert to_units(df, "si", ["DBT"]).equals(df[["DBT"]])
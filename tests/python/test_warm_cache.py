@@ -0,0 +1,34 @@
+import warm_cache
+from my_project import dataset_cache as dataset_cache_module
+from my_project import extract_df
+from my_project.blob_store import BlobStore, epw_digest
+from my_project.dataset_cache import DatasetCache
+from my_project.epw_mirror import EpwMirror
+from test_epw_download import epw_server  # noqa: F401
+
+
+def new_dataset_cache(tmp_path):
+    return DatasetCache(cache_dir=str(tmp_path / "datasets"), max_disk_bytes=2**30)
+
+
+def test_warm_cache(tmp_path, monkeypatch, epw_server):  # noqa: F811
+    # the workers are forked and inherit the caches of the test directory
+    monkeypatch.setattr(warm_cache, "epw_store", BlobStore(str(tmp_path / "epw")))
+    monkeypatch.setattr(warm_cache, "dataset_cache", new_dataset_cache(tmp_path))
+    monkeypatch.setattr(extract_df, "epw_mirror", EpwMirror(str(tmp_path / "mirror")))
+    url = f"{epw_server}/station.epw"
+
+    assert warm_cache.main([url, "--workers", "1"]) == 0
+    digest = epw_digest(extract_df.get_data(url))
+    assert warm_cache.epw_store.get(digest) is not None
+    # a new cache, like the one of the app, reads the dataset from disk
+    df, location_info = new_dataset_cache(tmp_path).get(DatasetCache.key(digest))
+    assert len(df) == 8760 and location_info["url"] == url
+
+    # a second run neither downloads the file nor computes its dataset again
+    def fail(*args):
+        raise AssertionError("called on a warm cache")
+
+    monkeypatch.setattr(extract_df, "download_epw", fail)
+    monkeypatch.setattr(dataset_cache_module, "create_df", fail)
+    assert warm_cache.main([url, "--workers", "1"]) == 0
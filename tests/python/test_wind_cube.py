@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from my_project.extract_df import create_df
+from my_project.template_graphs import wind_rose
+from my_project.wind_cube import speed_bins, wind_cube, wind_rose_histogram
+from test_extract_df import import_epw_lines
+
+
+def test_wind_cube_window():
+    df, _ = create_df(import_epw_lines(), "x.epw")
+    cube = wind_cube(df, "si")
+
+    counts, calm, hours = cube.window([12, 2], [22, 5])
+    selected = df.loc[
+        df["month"].isin([12, 1, 2]) & ((df["hour"] >= 22) | (df["hour"] <= 5))
+    ]
+    assert hours == len(selected)
+    assert calm == (selected["wind_speed"] == 0).sum()
+
+    speed = pd.cut(selected["wind_speed"], speed_bins("si"), labels=False)
+    sector = (np.mod(selected["wind_dir"] + 11.25, 360) // 22.5).astype(int)
+    expected = pd.crosstab(speed, sector).reindex(
+        index=range(10), columns=range(16), fill_value=0
+    )
+    assert counts.shape == (10, 16)
+    assert (counts == expected.to_numpy()).all()
+
+
+def test_wind_cube_missing_values():
+    df, _ = create_df(import_epw_lines(), "x.epw")
+    north = wind_cube(df, "si").window([1, 12], [1, 24])[0][:, 0].sum()
+
+    # missing directions and speeds are not in the roses but are counted in the hours
+    df.iloc[:500, df.columns.get_loc("wind_dir")] = 999
+    df.iloc[500:600, df.columns.get_loc("wind_speed")] = np.nan
+    counts, _, hours = wind_cube(df, "si").window([1, 12], [1, 24])
+    assert hours == len(df)
+    assert counts.sum() == len(df) - 600
+    assert counts[:, 0].sum() <= north
+
+
+def test_wind_rose_histogram():
+    df, _ = create_df(import_epw_lines(), "x.epw")
+    rose = wind_rose_histogram(df, "si")
+
+    frequency = np.array(rose["frequency"])
+    assert frequency.shape == (16, 10)
+    # the calm hours are spread over the directions as in the chart
+    calm = (df["wind_speed"] == 0).mean() * 100
+    assert np.allclose(frequency[:, 0], calm / 16, atol=1e-4)
+    assert np.isclose(
+        frequency[:, 1:].sum(), (df["wind_speed"] > 0.5).mean() * 100, atol=0.01
+    )
+    figure = wind_rose(wind_cube(df, "si"), "", [1, 12], [1, 24], True, "si")
+    chart = np.array([trace.r for trace in figure.data]).T
+    assert np.allclose(frequency, chart, atol=1e-4)
+
+    # missing directions are not counted in any direction
+    df.iloc[:500, df.columns.get_loc("wind_dir")] = 999
+    missing = np.array(wind_rose_histogram(df, "si")["frequency"])
+    assert missing[:, 1:].sum() < frequency[:, 1:].sum()
+    assert missing[0].sum() <= frequency[0].sum()
+    assert missing[12].sum() <= frequency[12].sum()
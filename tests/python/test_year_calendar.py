@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from my_project.extract_df import create_df
+from my_project.year_calendar import calendar_table, local_times
+from test_extract_df import import_epw_lines
+
+
+def test_calendar_is_shared_by_datasets():
+    calendar = calendar_table()
+    df, location_info = create_df(import_epw_lines(), "x.epw")
+
+    assert "fake_year" not in df.columns
+    assert (df["month"].to_numpy() == calendar["month"]).all()
+    assert (df["hour"].to_numpy() == calendar["hour"]).all()
+    assert df["DOY"].iloc[-1] == 365 and df["month_names"].iloc[-1] == "Dec"
+    assert np.shares_memory(df["DOY"].to_numpy(), calendar["DOY"])
+    assert df.index.equals(local_times(location_info["time_zone"]))
+
+    with pytest.raises(ValueError):
+        calendar["DOY"][0] = 0
@@ -0,0 +1,86 @@
+"""Download and process the EPW files of a list of stations ahead of time, so that
+the app loads them from the local cache.
+
+Usage:
+    python warm_cache.py URL_OR_STATION_ID [URL_OR_STATION_ID ...] [--workers N]
+    python warm_cache.py --file popular_stations.txt
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from my_project.blob_store import epw_store
+from my_project.dataset_cache import dataset_cache
+from my_project.extract_df import get_data
+from my_project.station_catalog import load_catalog
+
+
+def station_urls(stations):
+    """Return the URLs of a list of station URLs or catalog ids."""
+    catalog = None
+    urls = []
+    for station in stations:
+        if station.isdigit():
+            if catalog is None:
+                catalog = load_catalog()
+            urls.append(catalog.at[int(station), "url"])
+        else:
+            urls.append(station)
+    return urls
+
+
+def warm_station(url):
+    """Download the EPW file at url and compute its dataset, return the time it took
+    and the error message if it failed."""
+    start = time.perf_counter()
+    try:
+        lines = get_data(url)
+        if lines is None:
+            return time.perf_counter() - start, "download failed"
+        digest = epw_store.put(lines)
+        dataset_cache.load(digest, url, lines=lines)
+    except Exception as e:
+        return time.perf_counter() - start, f"{type(e).__name__}: {e}"
+    return time.perf_counter() - start, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("stations", nargs="*", help="station URLs or catalog ids")
+    parser.add_argument("--file", help="file with one station URL or id per line")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    args = parser.parse_args(argv)
+
+    stations = list(args.stations)
+    if args.file:
+        with open(args.file) as f:
+            stations += [line.strip() for line in f if line.strip()]
+    if not stations:
+        parser.error("no stations given")
+
+    try:
+        urls = station_urls(stations)
+    except KeyError as e:
+        parser.error(f"unknown station id {e}")
+
+    failures = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(warm_station, url): url for url in urls}
+        for future in as_completed(futures):
+            seconds, error = future.result()
+            status = "ok" if error is None else f"FAILED ({error})"
+            print(f"{seconds:7.2f} s  {status}  {futures[future]}", flush=True)
+            failures += error is not None
+
+    print(
+        f"Warmed {len(urls) - failures} of {len(urls)} stations in "
+        f"{time.perf_counter() - start:.1f} s"
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())